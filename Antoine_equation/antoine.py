@@ -1,15 +1,6 @@
 import numpy as np
 
 
-antoine_constants = {
-    "C1": {"A": 3.9895, "B": 443.028, "C": -0.49, "T_c": 190.6, "P_c": 46.1, "omega": 0.011},
-    "C3": {"A": 4.01158, "B": 834.26, "C": -22.763, "T_c": 369.9, "P_c": 42.5, "omega": 0.152},
-    "C5": {"A": 3.9892, "B": 1070.617, "C": -40.454, "T_c": 469.8, "P_c": 33.6, "omega": 0.249},
-    "C7": {"A": 4.81803, "B": 1635.409, "C": -27.338, "T_c": 540, "P_c": 27.4, "omega": 0.302},
-    "H2O": {"A": 4.6543, "B": 1435.264, "C": -64.848, "T_c": 647, "P_c": 220.64, "omega": 0.344},
-}
-
-
 def antoine_equation(A, B, C, T):
     """
     Calculate the vapor pressure using Antoine's equation.
@@ -18,19 +9,38 @@ def antoine_equation(A, B, C, T):
         A (float): Antoine constant A
         B (float): Antoine constant B
         C (float): Antoine constant C
-        T (float): Temperature in Kelvin
+        T (float or ndarray): Temperature in Kelvin
 
     Returns:
-        float: Vapor pressure in the unit consistent with Antoine constants
+        float or ndarray: Vapor pressure in the unit consistent with Antoine constants
     """
     # Ensure T > 0 to avoid division by zero or log of negative
-    if T <= 0:
+    if np.any(np.asarray(T) <= 0):
         raise ValueError("Temperature must be greater than 0 K")
     # Antoine equation
     P_sat = 10 ** (A - (B / (T + C)))
     return P_sat
 
 
+def extended_antoine_equation(A, B, C, D, E, T):
+    """
+    Extended Antoine equation log10(P) = A - B/(T + C) + D*T + E*log10(T).
+
+    With D = E = 0 it is antoine_equation. The extra terms follow the
+    curvature of ln(P) against 1/T over wider temperature ranges.
+
+    Parameters:
+        A, B, C, D, E (float or ndarray): Extended Antoine constants
+        T (float or ndarray): Temperature in Kelvin
+
+    Returns:
+        float or ndarray: Vapor pressure in the unit consistent with the constants
+    """
+    if np.any(np.asarray(T) <= 0):
+        raise ValueError("Temperature must be greater than 0 K")
+    return 10 ** (A - B / (T + C) + D * T + E * np.log10(T))
+
+
 # # Test the function for methane (C1) in the range 70K to 190K
 # component = "C1"
 # T_range = np.linspace(70, antoine_constants[component]["T_c"], 70)
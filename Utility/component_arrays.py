@@ -0,0 +1,27 @@
+import numpy as np
+
+
+def stack_components(components, names=None, extra_dims=0):
+    """
+    Stack component property dicts into a single dict of NumPy arrays.
+
+    The result can be passed anywhere a single component dict is accepted
+    (srk_parameters, peng_robinson_z_factors, ...). Component axis comes
+    first, followed by extra_dims singleton axes, so that with
+    extra_dims=2, T of shape (n_T, 1) and P of shape (n_P,) broadcast to a
+    (component x temperature x pressure) grid in one call.
+
+    Parameters:
+        components (dict): Mapping of component name to property dict
+        names (list): Component names to stack, defaults to all of them
+        extra_dims (int): Number of trailing singleton axes to append
+
+    Returns:
+        dict: Property name -> array of shape (n_components,) + (1,) * extra_dims
+    """
+    if names is None:
+        names = list(components)
+    shape = (len(names),) + (1,) * extra_dims
+    keys = components[names[0]].keys()
+    return {key: np.array([components[name][key] for name in names], dtype=float).reshape(shape)
+            for key in keys}
@@ -0,0 +1,234 @@
+import math
+
+import numpy as np
+from Utility.instrumentation import instrumentation
+
+
+def _solve_cubic_scalar(c2, c1, c0):
+    # Same steps as solve_cubic on Python floats; NumPy's per-call overhead dominates for a single cubic
+    shift = c2 / 3.0
+    p = c1 - c2 * shift
+    q = 2.0 * shift ** 3 - shift * c1 + c0
+    discriminant = (q / 2.0) ** 2 + (p / 3.0) ** 3
+    if discriminant > 0.0:
+        sqrt_d = math.sqrt(discriminant)
+        z_high = math.cbrt(-q / 2.0 + sqrt_d) + math.cbrt(-q / 2.0 - sqrt_d) - shift
+    else:
+        m = 2.0 * math.sqrt(-p / 3.0)
+        theta = math.acos(min(max(3.0 * q / (p * m), -1.0), 1.0)) / 3.0 if m > 0.0 else 0.0
+        z_high = m * math.cos(theta) - shift
+
+    for _ in range(2):
+        f = ((z_high + c2) * z_high + c1) * z_high + c0
+        df = (3.0 * z_high + 2.0 * c2) * z_high + c1
+        if df != 0.0:
+            z_high -= f / df
+
+    if z_high == 0.0:
+        return (z_high, z_high, z_high), False
+    e0 = -c0 / z_high
+    e1 = (e0 - c1) / z_high
+    quadratic_discriminant = e1 * e1 - 4.0 * e0
+    if quadratic_discriminant < 0.0:
+        return (z_high, z_high, z_high), False
+    root_q = -0.5 * (e1 + math.copysign(math.sqrt(quadratic_discriminant), e1))
+    if root_q == 0.0:
+        root_q = 1.0
+    z_a, z_b = root_q, e0 / root_q
+    return (min(z_a, z_b, z_high), min(max(z_a, z_b), z_high), z_high), True
+
+
+def solve_cubic(c2, c1, c0):
+    """
+    Solve Z**3 + c2*Z**2 + c1*Z + c0 = 0 in closed form for arrays of coefficients.
+
+    The largest real root comes from Cardano's formula (one real root) or the
+    trigonometric method (three real roots), selected element-wise with a mask
+    on the sign of the discriminant, and is polished with Newton steps. The
+    other two roots come from the deflated quadratic, which stays accurate at
+    very low pressures where the liquid root is many orders of magnitude
+    smaller than the vapor root and the cubic discriminant loses all precision.
+
+    Parameters:
+        c2 (array_like): Coefficient of Z**2
+        c1 (array_like): Coefficient of Z
+        c0 (array_like): Constant term
+
+    Returns:
+        tuple: (roots, three_real) where roots has shape (..., 3) holding the real
+        roots in ascending order and three_real is a boolean array that is True
+        where the cubic has three real roots. Where it has one, all three
+        entries hold that root. Scalar coefficients take a pure-Python path
+        and return a tuple of three floats and a bool instead.
+    """
+    if np.ndim(c2) == 0 and np.ndim(c1) == 0 and np.ndim(c0) == 0:
+        if instrumentation.enabled:
+            instrumentation.count("cubic_solves")
+        return _solve_cubic_scalar(float(c2), float(c1), float(c0))
+
+    c2, c1, c0 = np.broadcast_arrays(*(np.asarray(c, dtype=float) for c in (c2, c1, c0)))
+
+    # Depressed cubic t**3 + p*t + q = 0 with Z = t - c2/3
+    shift = c2 / 3.0
+    p = c1 - c2 * shift
+    q = 2.0 * shift ** 3 - shift * c1 + c0
+    discriminant = (q / 2.0) ** 2 + (p / 3.0) ** 3
+    trigonometric = discriminant <= 0.0
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # One real root (Cardano)
+        sqrt_d = np.sqrt(np.where(trigonometric, 0.0, discriminant))
+        t_single = np.cbrt(-q / 2.0 + sqrt_d) + np.cbrt(-q / 2.0 - sqrt_d)
+
+        # Largest of three real roots (trigonometric); p <= 0 whenever the discriminant is <= 0
+        m = 2.0 * np.sqrt(np.where(trigonometric, -p / 3.0, 0.0))
+        safe_m = np.where(m > 0.0, m, 1.0)
+        safe_p = np.where(m > 0.0, p, -1.0)
+        theta = np.arccos(np.clip(3.0 * q / (safe_p * safe_m), -1.0, 1.0)) / 3.0
+        t_high = m * np.cos(theta)
+
+        z_high = np.where(trigonometric, t_high, t_single) - shift
+
+        # Newton polish of the largest root
+        for _ in range(2):
+            f = ((z_high + c2) * z_high + c1) * z_high + c0
+            df = (3.0 * z_high + 2.0 * c2) * z_high + c1
+            z_high = z_high - np.where(df != 0.0, f / np.where(df == 0.0, 1.0, df), 0.0)
+
+        # Deflate: Z**3 + c2*Z**2 + c1*Z + c0 = (Z - z_high) * (Z**2 + e1*Z + e0)
+        safe_z = np.where(z_high != 0.0, z_high, 1.0)
+        e0 = -c0 / safe_z
+        e1 = (e0 - c1) / safe_z
+        quadratic_discriminant = e1 ** 2 - 4.0 * e0
+        three_real = (quadratic_discriminant >= 0.0) & (z_high != 0.0)
+
+        # Numerically stable quadratic roots
+        sqrt_qd = np.sqrt(np.where(three_real, quadratic_discriminant, 0.0))
+        root_q = -0.5 * (e1 + np.copysign(sqrt_qd, e1))
+        root_q = np.where(root_q != 0.0, root_q, 1.0)
+        z_a = root_q
+        z_b = e0 / root_q
+
+    roots = np.empty(c2.shape + (3,))
+    roots[..., 0] = np.where(three_real, np.minimum(z_a, z_b), z_high)
+    roots[..., 1] = np.where(three_real, np.maximum(z_a, z_b), z_high)
+    roots[..., 2] = z_high
+    # The deflated roots can only exceed z_high through round-off
+    roots[..., :2] = np.minimum(roots[..., :2], z_high[..., None])
+    if instrumentation.enabled:
+        instrumentation.count("cubic_solves", c2.size)
+    return roots, three_real
+
+
+def z_roots(A, B):
+    """
+    Solve the cubic EOS for the liquid and vapor compressibility factors.
+
+    Uses the cubic Z**3 - (1 - B)*Z**2 + (A - 2B - 3B**2)*Z - (AB - B**2 - B**3) = 0
+    shared by the srk_eos and peng_robinson modules.
+
+    Parameters:
+        A (array_like): Dimensionless attraction parameter a*P/(R*T)**2
+        B (array_like): Dimensionless co-volume parameter b*P/(R*T)
+
+    Returns:
+        tuple: (Z_liquid, Z_vapor, three_real). Where only one physical root
+        (Z > B) exists Z_liquid and Z_vapor are both equal to it and
+        three_real is False. Scalar A and B give plain floats and a bool.
+    """
+    if np.ndim(A) == 0 and np.ndim(B) == 0:
+        A = float(A)
+        B = float(B)
+        (Z_low, _, Z_vapor), three_real = solve_cubic(-(1 - B), A - 2 * B - 3 * B ** 2, -(A * B - B ** 2 - B ** 3))
+        physical = Z_low > B
+        if instrumentation.enabled:
+            instrumentation.count("root_rejected", three_real and not physical)
+            instrumentation.count("single_root", not (three_real and physical))
+        three_real = three_real and physical
+        return (Z_low if three_real else Z_vapor), Z_vapor, three_real
+
+    A = np.asarray(A, dtype=float)
+    B = np.asarray(B, dtype=float)
+    roots, three_real = solve_cubic(-(1 - B), A - 2 * B - 3 * B ** 2, -(A * B - B ** 2 - B ** 3))
+    Z_vapor = roots[..., 2]
+    # Drop the smallest root when it lies below the co-volume (V < b is unphysical)
+    physical = roots[..., 0] > B
+    if instrumentation.enabled:
+        instrumentation.count("root_rejected", np.count_nonzero(three_real & ~physical))
+        instrumentation.count("single_root", np.count_nonzero(~(three_real & physical)))
+    three_real = three_real & physical
+    Z_liquid = np.where(three_real, roots[..., 0], Z_vapor)
+    return Z_liquid, Z_vapor, three_real
+
+
+def _spinodal_function(eta):
+    # beta = b*R*T/a at which v = b/eta is a spinodal volume
+    return 2 * eta * (1 + eta) * (1 - eta) ** 2 / (1 + 2 * eta - eta ** 2) ** 2
+
+
+def _critical_eta():
+    # b/v at the critical point, where _spinodal_function peaks (golden-section search)
+    low, high = 0.0, 1.0
+    ratio = (np.sqrt(5) - 1) / 2
+    while high - low > 1e-15:
+        left = high - ratio * (high - low)
+        right = low + ratio * (high - low)
+        if _spinodal_function(left) < _spinodal_function(right):
+            low = left
+        else:
+            high = right
+    return 0.5 * (low + high)
+
+
+ETA_CRITICAL = _critical_eta()
+
+# beta = B/A and B at the critical point of the z_roots cubic; the same for every component
+BETA_CRITICAL = _spinodal_function(ETA_CRITICAL)
+B_CRITICAL = ETA_CRITICAL / (1 - ETA_CRITICAL) - ETA_CRITICAL ** 2 / (
+    BETA_CRITICAL * (1 + 2 * ETA_CRITICAL - ETA_CRITICAL ** 2))
+
+
+def spinodal_B(beta, n_bisect=60):
+    """
+    Spinodal (limit-of-stability) states of the z_roots cubic at fixed temperature.
+
+    At fixed T the ratio beta = B/A = b*R*T/a does not depend on pressure.
+    The cubic has three real roots exactly between the two spinodal pressures,
+    where its discriminant changes sign; there dP/dv = 0, which in terms of
+    eta = b/v reads beta = 2*eta*(1 + eta)*(1 - eta)**2 / (1 + 2*eta - eta**2)**2.
+    The right-hand side rises from 0 to its maximum at ETA_CRITICAL and falls
+    back to 0 at eta = 1, so each spinodal is found by vectorized bisection on
+    one monotone branch.
+
+    Parameters:
+        beta (array_like): B/A for each temperature
+        n_bisect (int): Number of bisection steps
+
+    Returns:
+        tuple: (B_min, B_max), the values of B at the liquid (lower) and vapor
+        (upper) spinodal pressures. B_min may be negative at low temperature.
+        Both are NaN where beta is supercritical and there is no spinodal.
+    """
+    beta = np.asarray(beta, dtype=float)
+    subcritical = beta < BETA_CRITICAL
+
+    # Both branches at once, row 0 the vapor branch (eta in (0, ETA_CRITICAL), function increasing) and row 1
+    # the liquid branch (eta in (ETA_CRITICAL, 1), decreasing). The brackets share one width per row, so
+    # each step only moves the lower end up where the root lies above the midpoint.
+    low = np.array([0.0, ETA_CRITICAL]).reshape((2,) + (1,) * beta.ndim) + np.zeros(beta.shape)
+    width = np.array([ETA_CRITICAL, 1 - ETA_CRITICAL]).reshape(low.shape[:1] + (1,) * beta.ndim)
+    decreasing = np.array([False, True]).reshape(width.shape)
+    for _ in range(n_bisect):
+        width = 0.5 * width
+        mid = low + width
+        low = np.where((_spinodal_function(mid) < beta) != decreasing, mid, low)
+    eta_vapor, eta_liquid = low + 0.5 * width
+
+    def pressure_B(eta):
+        # B = b*P/(R*T) from P = R*T/(v - b) - a/(v**2 + 2*b*v - b**2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return eta / (1 - eta) - eta ** 2 / (beta * (1 + 2 * eta - eta ** 2))
+
+    B_min = np.where(subcritical, pressure_B(eta_liquid), np.nan)
+    B_max = np.where(subcritical, pressure_B(eta_vapor), np.nan)
+    return B_min, B_max
@@ -0,0 +1,63 @@
+import numpy as np
+from Utility.cubic_solver import z_roots
+from Utility.instrumentation import instrumentation
+
+# Gas constant in J·mol^−1·K^−1 for molar volumes and departure functions
+R = 8.3144598
+
+SQRT2 = np.sqrt(2)
+
+
+def property_bundle(T, P, A, B, dln_alpha_dln_T):
+    """
+    Volumetric and residual properties of both phases from one root solve.
+
+    Both EOS in this package share the cubic of Utility.cubic_solver.z_roots
+    and the ln(phi) form with L = ln((Z + (1 + sqrt2)B) / (Z + (1 - sqrt2)B)).
+    With q = A/(2*sqrt2*B) and the alpha-function derivative d ln(alpha)/d ln(T),
+    the residual properties of a root Z are
+
+        H_res/(R*T) = Z - 1 + q*(dln_alpha_dln_T - 1)*L
+        S_res/R     = ln(Z - B) + q*dln_alpha_dln_T*L
+        ln(phi)     = H_res/(R*T) - S_res/R
+
+    so L and ln(Z - B) are evaluated once per root and shared by all three.
+
+    Parameters:
+        T (float or ndarray): Temperature in Kelvin
+        P (float or ndarray): Pressure in Pa
+        A (float or ndarray): Dimensionless attraction parameter a*P/(R*T)**2
+        B (float or ndarray): Dimensionless co-volume parameter b*P/(R*T)
+        dln_alpha_dln_T (float or ndarray): T/alpha * d(alpha)/dT
+
+    Returns:
+        dict: Arrays broadcast over the inputs: "Z_liquid", "Z_vapor", "three_real",
+        molar volumes "V_liquid", "V_vapor" (m³/mol), molar densities "rho_liquid",
+        "rho_vapor" (mol/m³), "ln_phi_liquid", "ln_phi_vapor", residual enthalpies
+        "H_res_liquid", "H_res_vapor" (J/mol), residual entropies "S_res_liquid",
+        "S_res_vapor" (J/mol/K) and "dH_vap" = H_res_vapor - H_res_liquid (J/mol),
+        the enthalpy of vaporization when P is the saturation pressure. Where only
+        one real root exists both phases are that root and dH_vap is zero.
+    """
+    T = np.asarray(T, dtype=float)
+    Z_liquid, Z_vapor, three_real = z_roots(A, B)
+    q = A / (2 * SQRT2 * B)
+    RT = R * T
+
+    bundle = {"Z_liquid": Z_liquid, "Z_vapor": Z_vapor, "three_real": three_real}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for phase, Z in (("liquid", Z_liquid), ("vapor", Z_vapor)):
+            L = np.log((Z + (1 + SQRT2) * B) / (Z + (1 - SQRT2) * B))
+            h = Z - 1 + q * (dln_alpha_dln_T - 1) * L
+            s = np.log(Z - B) + q * dln_alpha_dln_T * L
+            V = Z * RT / P
+            bundle[f"V_{phase}"] = V
+            bundle[f"rho_{phase}"] = 1 / V
+            bundle[f"ln_phi_{phase}"] = np.clip(h - s, -700, 700)
+            bundle[f"H_res_{phase}"] = h * RT
+            bundle[f"S_res_{phase}"] = s * R
+    bundle["dH_vap"] = bundle["H_res_vapor"] - bundle["H_res_liquid"]
+
+    if instrumentation.enabled:
+        instrumentation.count("fugacity_evaluations", 2 * np.size(Z_vapor))
+    return bundle
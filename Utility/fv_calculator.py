@@ -1,4 +1,7 @@
+import numpy as np
+
+
 def fv_calculator(phi_vapor, P_sat):
 
-    return abs(phi_vapor * P_sat)
+    return np.abs(phi_vapor * P_sat)
 
@@ -0,0 +1,107 @@
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger(__name__)
+
+_NULL_TIMER = nullcontext()
+
+
+class Instrumentation:
+    """
+    Counters and timers for the solver hot paths.
+
+    Instrumented code guards every record with `if instrumentation.enabled:`,
+    so while disabled (the default) the only cost is one attribute check per
+    call. While enabled, counters accumulate element counts (an array call
+    that solves 1000 cubics adds 1000 to "cubic_solves") and every record is
+    also passed to the registered callbacks as callback(name, value).
+
+    Counter names used by the package:
+        cubic_solves          cubics solved by solve_cubic
+        single_root           z_roots states with one physical root (liquid and vapor collapse)
+        root_rejected         z_roots states whose smallest root fell below B and was discarded
+        fugacity_evaluations  ln(phi) evaluations
+        saturation_points     points handed to solve_saturation_pressure
+        iterations            solver iterations (summed over points)
+        not_converged         points that hit max_iter or failed
+        zero_derivative       newton_raphson stops on a zero derivative
+        envelope_rejected     points above the EOS critical temperature rejected before iterating
+    Timers (seconds): saturation_solve, newton_raphson.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.counters = defaultdict(int)
+        self.timers = defaultdict(float)
+        self.callbacks = []
+
+    def enable(self, callback=None):
+        if callback is not None:
+            self.callbacks.append(callback)
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        self.callbacks.clear()
+
+    def reset(self):
+        self.counters.clear()
+        self.timers.clear()
+
+    def count(self, name, value=1):
+        value = int(value)
+        self.counters[name] += value
+        for callback in self.callbacks:
+            callback(name, value)
+
+    def add_time(self, name, seconds):
+        self.timers[name] += seconds
+        for callback in self.callbacks:
+            callback(name, seconds)
+
+    def timer(self, name):
+        """Context manager adding the elapsed wall time to timers[name]; a no-op while disabled."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timer(name)
+
+    @contextmanager
+    def _timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def snapshot(self):
+        return {"counters": dict(self.counters), "timers": dict(self.timers)}
+
+    def log_summary(self, level=logging.INFO):
+        for name, value in sorted(self.counters.items()):
+            logger.log(level, "%s: %d", name, value)
+        for name, seconds in sorted(self.timers.items()):
+            logger.log(level, "%s: %.6f s", name, seconds)
+
+
+instrumentation = Instrumentation()
+
+
+@contextmanager
+def collect(callback=None):
+    """
+    Enable instrumentation with fresh counters for the duration of a block.
+
+        with collect() as metrics:
+            solve_saturation_pressure(T, component)
+        metrics.snapshot()
+
+    Previous counters are cleared; instrumentation is disabled on exit.
+    """
+    instrumentation.reset()
+    instrumentation.enable(callback)
+    try:
+        yield instrumentation
+    finally:
+        instrumentation.disable()
@@ -0,0 +1,90 @@
+from collections import OrderedDict
+
+import numpy as np
+
+
+class ParameterCache:
+    """
+    Bounded cache for temperature-only quantities that are expensive to
+    compute, such as the spinodal bounds of a temperature.
+
+    Entries are evicted in least-recently-used order (policy="lru") or in
+    insertion order (policy="fifo") once maxsize is reached. Hit, miss and
+    eviction counters are kept for profiling.
+    """
+
+    def __init__(self, maxsize=4096, policy="lru"):
+        if policy not in ("lru", "fifo"):
+            raise ValueError("policy must be 'lru' or 'fifo'")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.enabled = True
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for key, calling compute() on a miss.
+        A key of None bypasses the cache.
+        """
+        if key is None or not self.enabled or self.maxsize <= 0:
+            return compute()
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+        else:
+            self.hits += 1
+            if self.policy == "lru":
+                self._entries.move_to_end(key)
+            return value
+
+        value = compute()
+        self._entries[key] = value
+        self._evict()
+        return value
+
+    def resize(self, maxsize):
+        self.maxsize = maxsize
+        self._evict()
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def info(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self._entries), "maxsize": self.maxsize, "policy": self.policy}
+
+    def _evict(self):
+        while len(self._entries) > max(self.maxsize, 0):
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+# Component properties the temperature-only quantities depend on; the kappa slopes are optional
+KEY_FIELDS = ("T_c", "P_c", "omega", "kappa_srk", "kappa_pr")
+
+
+def parameter_key(eos, T, component):
+    """
+    Cache key (eos, T_c, P_c, omega[, kappa_srk, kappa_pr], T) for temperature-only
+    quantities, or None when the component properties are arrays and the call
+    should bypass the cache. Array temperatures are keyed by their shape and raw
+    bytes; T=None gives the key of the component alone.
+    """
+    properties = tuple((field, component[field]) for field in KEY_FIELDS if field in component)
+    if any(np.ndim(value) != 0 for _, value in properties):
+        return None
+    properties = tuple((field, float(value)) for field, value in properties)
+    if T is None:
+        return (eos,) + properties
+    if np.ndim(T) == 0:
+        return (eos,) + properties + (float(T),)
+    T = np.ascontiguousarray(T, dtype=float)
+    return (eos,) + properties + (T.shape, T.tobytes())
+
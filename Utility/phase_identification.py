@@ -0,0 +1,72 @@
+import numpy as np
+from Utility.cubic_solver import spinodal_B
+
+# Distance in ln(P) kept from a spinodal when a pressure is moved into the envelope;
+# exactly at a spinodal round-off can lose the root that is about to vanish
+ENVELOPE_MARGIN = 0.05
+
+
+def envelope_bounds(A1, B1):
+    """
+    Spinodal pressures bounding the three-root region of the z_roots cubic.
+
+    The saturation pressure always lies between them, and fugacity equality
+    cannot hold anywhere else. Both EOS share the cubic, so the bounds only
+    depend on the reduced coefficients A1 = A/P and B1 = B/P.
+
+    Parameters:
+        A1 (array_like): A/P for each temperature
+        B1 (array_like): B/P for each temperature
+
+    Returns:
+        tuple: (P_low, P_high) in Pa. P_low is 0 where the liquid spinodal
+        pressure is negative (low temperature); both are NaN where the
+        temperature is above the EOS critical temperature.
+    """
+    A1 = np.asarray(A1, dtype=float)
+    B1 = np.asarray(B1, dtype=float)
+    B_min, B_max = spinodal_B(B1 / A1)
+    P_high = B_max / B1
+    P_low = np.where(np.isnan(B_min), np.nan, np.maximum(B_min, 0.0) / B1)
+    return P_low, P_high
+
+
+def into_envelope(P, P_low, P_high, margin=ENVELOPE_MARGIN):
+    """
+    Move pressures that lie outside the spinodal bounds just inside them.
+
+    Pressures already inside are returned unchanged. A pressure outside is
+    placed `margin` in ln(P) inside the nearer bound, or at the middle of
+    the envelope when it is narrower than twice the margin.
+
+    Returns:
+        tuple: (P, feasible) where feasible is False where there is no
+        envelope (supercritical) and P is left unchanged
+    """
+    P = np.asarray(P, dtype=float)
+    feasible = ~np.isnan(P_high)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ln_low = np.log(np.where(P_low > 0, P_low, np.finfo(float).tiny))
+        ln_high = np.log(P_high)
+        shift = np.minimum(margin, 0.5 * (ln_high - ln_low))
+        ln_P = np.log(P)
+        outside = feasible & ((ln_P < ln_low + shift) | (ln_P > ln_high - shift))
+        ln_P = np.clip(ln_P, ln_low + shift, ln_high - shift)
+    return np.where(outside, np.exp(ln_P), P), feasible
+
+
+def select_roots(Z_factors, B):
+    """
+    Liquid and vapor roots from a list of real roots such as srk_eos returns.
+
+    The vapor root is the largest one. The liquid root is the smallest one
+    above the co-volume (Z > B); where that is the vapor root itself only one
+    phase exists.
+
+    Returns:
+        tuple: (Z_liquid, Z_vapor, three_real)
+    """
+    physical = [Z for Z in Z_factors if Z > B]
+    Z_vapor = max(Z_factors)
+    Z_liquid = min(physical) if physical else Z_vapor
+    return Z_liquid, Z_vapor, Z_liquid < Z_vapor
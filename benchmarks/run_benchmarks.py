@@ -0,0 +1,309 @@
+"""
+Offline benchmarks for the EOS, fugacity and saturation-solver hot paths.
+
+    python benchmarks/run_benchmarks.py                       # run everything and print a table
+    python benchmarks/run_benchmarks.py -k sweep --repeat 5   # only benchmarks whose name contains "sweep"
+    python benchmarks/run_benchmarks.py --save baseline.json  # store the results as a baseline
+    python benchmarks/run_benchmarks.py --compare baseline.json
+
+Every benchmark reports the best and median wall time over the repeats,
+points per second, EOS evaluations (cubic solves) per point and the peak
+memory allocated during one run (tracemalloc). --compare exits with
+status 1 when any benchmark's throughput dropped by more than --threshold.
+"""
+import argparse
+import atexit
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+from components.registry import antoine_constants  # noqa: E402
+from newthon_raphson.newton_raphson import fugacity_derivative, newton_raphson  # noqa: E402
+from peng_robinson.peng_robinson import peng_robinson_z_factors  # noqa: E402
+from saturation.disk_cache import cached_saturation_curve  # noqa: E402
+from saturation.psat_solver import antoine_pressure, solve_saturation_pressure  # noqa: E402
+from saturation.residual import spinodal_cache  # noqa: E402
+from saturation.tables import build_saturation_table  # noqa: E402
+from srk_eos.srk_eos import R, srk_eos, srk_fugacity_coefficient  # noqa: E402
+from Utility.component_arrays import stack_components  # noqa: E402
+from Utility.instrumentation import collect  # noqa: E402
+
+# setup() runs untimed before every repeat; run() returns (points, EOS evaluations, converged points),
+# with evaluations None where the benchmark does not solve the EOS or cannot count it. The solver
+# benchmarks count evaluations as the cubic solves recorded by Utility.instrumentation
+Benchmark = namedtuple("Benchmark", ["name", "setup", "run"])
+
+SWEEP_T_MIN = 70.0
+
+
+def _nothing():
+    pass
+
+
+def _sweep_temperatures(component):
+    return np.arange(SWEEP_T_MIN, component["T_c"], 1.0)
+
+
+def _counted_solve(T, component, eos):
+    with collect() as metrics:
+        _, _, converged = solve_saturation_pressure(T, component, eos)
+    return np.size(T), metrics.counters["cubic_solves"], int(converged.sum())
+
+
+def _counting(function):
+    # Wrap an EOS callable so the legacy solvers report how often they evaluated it
+    def counted(*args):
+        counted.calls += 1
+        return function(*args)
+    counted.calls = 0
+    return counted
+
+
+def single_point_benchmarks(n_calls):
+    component = antoine_constants["C3"]
+    T, P = 300.0, 1.0e6
+
+    def run_srk_eos():
+        for _ in range(n_calls):
+            srk_eos(T, P, component)
+        return n_calls, n_calls, n_calls
+
+    def run_pr_z_factors():
+        for _ in range(n_calls):
+            peng_robinson_z_factors(T, P, component)
+        return n_calls, n_calls, n_calls
+
+    Z_factors, A, B = srk_eos(T, P, component)
+
+    def run_srk_fugacity_coefficient():
+        for _ in range(n_calls):
+            srk_fugacity_coefficient(Z_factors[0], A, B)
+        return n_calls, None, n_calls
+
+    def run_fugacity_derivative():
+        Z_func = _counting(srk_eos)
+        calls = n_calls // 10
+        for _ in range(calls):
+            fugacity_derivative(Z_func, srk_fugacity_coefficient, R, P, T, component)
+        return calls, Z_func.calls, calls
+
+    return [
+        Benchmark("single/srk_eos", _nothing, run_srk_eos),
+        Benchmark("single/peng_robinson_z_factors", _nothing, run_pr_z_factors),
+        Benchmark("single/srk_fugacity_coefficient", _nothing, run_srk_fugacity_coefficient),
+        Benchmark("single/fugacity_derivative", _nothing, run_fugacity_derivative),
+    ]
+
+
+def newton_raphson_benchmarks():
+    component = antoine_constants["C3"]
+    temperatures = np.arange(150.0, 360.0, 5.0)
+
+    def make_run(derivative):
+        def run():
+            Z_func = _counting(srk_eos)
+            with collect() as metrics:
+                for T in temperatures:
+                    newton_raphson(Z_func, srk_fugacity_coefficient, R, float(antoine_pressure(T, component)),
+                                   float(T), component, derivative=derivative)
+            return temperatures.size, Z_func.calls, temperatures.size - metrics.counters["not_converged"]
+        return run
+
+    return [Benchmark(f"newton_raphson/srk_{derivative}", _nothing, make_run(derivative))
+            for derivative in ("analytic", "numeric")]
+
+
+def sweep_benchmarks():
+    benchmarks = []
+    for name, component in antoine_constants.items():
+        T = _sweep_temperatures(component)
+        for eos in ("srk", "pr"):
+            def run(T=T, component=component, eos=eos):
+                return _counted_solve(T, component, eos)
+            benchmarks.append(Benchmark(f"sweep/{name}_{eos}", spinodal_cache.clear, run))
+    return benchmarks
+
+
+def grid_benchmarks(n_temperatures):
+    # Every component on a dense reduced-temperature grid, solved in one call
+    stacked = stack_components(antoine_constants, extra_dims=1)
+    T = stacked["T_c"] * np.linspace(0.35, 0.97, n_temperatures)
+
+    benchmarks = []
+    for eos in ("srk", "pr"):
+        def run(eos=eos):
+            return _counted_solve(T, stacked, eos)
+        benchmarks.append(Benchmark(f"grid/{T.size}_points_{eos}", spinodal_cache.clear, run))
+    return benchmarks
+
+
+def cache_benchmarks(n_lookups):
+    component = antoine_constants["C5"]
+    T = _sweep_temperatures(component)
+    cache_dir = tempfile.mkdtemp(prefix="vp-bench-")
+    atexit.register(shutil.rmtree, cache_dir, True)
+
+    def sweep():
+        return _counted_solve(T, component, "srk")
+
+    def clear_disk_cache():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        os.makedirs(cache_dir)
+
+    def warm_disk_cache():
+        cached_saturation_curve(T, component, "srk", name="C5", cache_dir=cache_dir)
+
+    def disk_cached():
+        # A miss solves the curve; a hit evaluates nothing
+        with collect() as metrics:
+            curve = cached_saturation_curve(T, component, "srk", name="C5", cache_dir=cache_dir)
+        return T.size, metrics.counters["cubic_solves"], int(np.sum(curve["converged"] > 0))
+
+    def build_table():
+        table = build_saturation_table(component, "srk", component_name="C5")
+        return table.inverse_T.size, None, table.inverse_T.size
+
+    table = build_saturation_table(component, "srk", component_name="C5")
+    lookup_T = np.linspace(table.T_min, table.T_max, n_lookups)
+
+    def table_lookup():
+        P = table(lookup_T)
+        return lookup_T.size, None, int(np.isfinite(P).sum())
+
+    return [
+        Benchmark("cache/spinodal_cold", spinodal_cache.clear, sweep),
+        Benchmark("cache/spinodal_warm", sweep, sweep),
+        Benchmark("cache/disk_cold", clear_disk_cache, disk_cached),
+        Benchmark("cache/disk_warm", warm_disk_cache, disk_cached),
+        Benchmark("cache/table_build", _nothing, build_table),
+        Benchmark("cache/table_lookup", _nothing, table_lookup),
+    ]
+
+
+def all_benchmarks(quick=False):
+    return (single_point_benchmarks(1000 if quick else 10000)
+            + newton_raphson_benchmarks()
+            + sweep_benchmarks()
+            + grid_benchmarks(200 if quick else 4000)
+            + cache_benchmarks(10000 if quick else 1000000))
+
+
+def measure(benchmark, repeat):
+    """
+    Time benchmark.run over `repeat` runs, then run it once more under
+    tracemalloc for the peak allocation.
+
+    Returns:
+        dict: Timing, throughput, evaluation count and memory figures
+    """
+    times = []
+    for _ in range(repeat):
+        benchmark.setup()
+        start = time.perf_counter()
+        points, evaluations, converged = benchmark.run()
+        times.append(time.perf_counter() - start)
+
+    benchmark.setup()
+    tracemalloc.start()
+    benchmark.run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(times)
+    return {
+        "points": points,
+        "converged": converged,
+        "best_s": best,
+        "median_s": statistics.median(times),
+        "points_per_s": points / best if best > 0 else float("inf"),
+        "evaluations_per_point": evaluations / points if evaluations is not None and points else None,
+        "peak_memory_mib": peak / 2 ** 20,
+    }
+
+
+def environment():
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.platform(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Relative throughput of every benchmark present in both runs.
+
+    Returns:
+        list: (name, current / baseline points per second, regressed) tuples
+    """
+    rows = []
+    for name, result in results.items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        ratio = result["points_per_s"] / previous["points_per_s"]
+        rows.append((name, ratio, ratio < 1 / threshold))
+    return rows
+
+
+def print_results(results, stream):
+    stream.write(f"{'benchmark':<36}{'best (ms)':>12}{'points/s':>14}{'evals/point':>13}{'peak (MiB)':>12}\n")
+    for name, result in results.items():
+        evaluations = result["evaluations_per_point"]
+        evaluations = "-" if evaluations is None else f"{evaluations:.2f}"
+        stream.write(f"{name:<36}{result['best_s'] * 1e3:>12.3f}{result['points_per_s']:>14.4g}"
+                     f"{evaluations:>13}{result['peak_memory_mib']:>12.2f}\n")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the EOS and saturation-solver hot paths.")
+    parser.add_argument("-k", dest="pattern", default=None, help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark (default: 3)")
+    parser.add_argument("--quick", action="store_true", help="smaller problem sizes")
+    parser.add_argument("--save", default=None, metavar="FILE", help="write results to a JSON baseline")
+    parser.add_argument("--compare", default=None, metavar="FILE", help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown factor counted as a regression (default: 1.25)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    benchmarks = [b for b in all_benchmarks(args.quick) if args.pattern is None or args.pattern in b.name]
+
+    results = {benchmark.name: measure(benchmark, args.repeat) for benchmark in benchmarks}
+    print_results(results, sys.stdout)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"environment": environment(), "quick": args.quick, "results": results}, f, indent=2)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, args.threshold)
+        sys.stdout.write(f"\ncompared with {args.compare} ({baseline['environment']['created']})\n")
+        for name, ratio, regressed in rows:
+            sys.stdout.write(f"{name:<36}{ratio:>10.2f}x{'  REGRESSION' if regressed else ''}\n")
+        if any(regressed for _, _, regressed in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
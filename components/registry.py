@@ -0,0 +1,152 @@
+import csv
+import json
+import os
+
+import numpy as np
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "components.csv")
+
+# Properties every solver reads from a component dict (Antoine A/B/C in bar and K, T_c in K, P_c in bar)
+PROPERTY_FIELDS = ("A", "B", "C", "T_c", "P_c", "omega")
+
+# EOS alpha-function slopes kappa(omega); stored alongside so they can be overridden by fitted values
+KAPPA_FIELDS = ("kappa_srk", "kappa_pr")
+
+COMPONENT_DTYPE = np.dtype([("name", "U32")] + [(field, np.float64) for field in PROPERTY_FIELDS + KAPPA_FIELDS])
+
+
+def srk_kappa(omega):
+    return 0.48 + 1.574 * omega - 0.176 * omega ** 2
+
+
+def peng_robinson_kappa(omega):
+    return 0.37464 + 1.54226 * omega - 0.26992 * omega ** 2
+
+
+class ComponentRegistry:
+    """
+    Component constants stored as one contiguous NumPy structured array.
+
+    Each row holds a component's name, Antoine constants, critical
+    properties, acentric factor and the SRK/PR kappa slopes. The
+    name -> row map makes single lookups O(1); take() gathers any index
+    array into a dict of property arrays that the EOS and saturation
+    functions accept in place of a single component dict.
+    """
+
+    def __init__(self, records):
+        self.records = np.ascontiguousarray(records, dtype=COMPONENT_DTYPE)
+        self.index = {str(name): i for i, name in enumerate(self.records["name"])}
+        if len(self.index) != len(self.records):
+            raise ValueError("duplicate component names")
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Build a registry from an iterable of mappings with a "name" and the
+        PROPERTY_FIELDS. kappa columns missing from a row are computed from omega.
+        """
+        records = []
+        for row in rows:
+            values = {field: float(row[field]) for field in PROPERTY_FIELDS}
+            omega = values["omega"]
+            for field, kappa in (("kappa_srk", srk_kappa), ("kappa_pr", peng_robinson_kappa)):
+                value = row.get(field)
+                values[field] = kappa(omega) if value in (None, "") else float(value)
+            records.append((str(row["name"]),) + tuple(values[field] for field in PROPERTY_FIELDS + KAPPA_FIELDS))
+        return cls(np.array(records, dtype=COMPONENT_DTYPE))
+
+    @classmethod
+    def from_dict(cls, components):
+        """Build a registry from the name -> property dict layout used throughout the code."""
+        return cls.from_rows(dict(properties, name=name) for name, properties in components.items())
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        """
+        Load components from a local CSV file (header row with name and the
+        property columns) or a JSON file holding either a list of row objects
+        or a name -> properties object.
+        """
+        if path.lower().endswith(".json"):
+            with open(path) as f:
+                data = json.load(f)
+            return cls.from_dict(data) if isinstance(data, dict) else cls.from_rows(data)
+        with open(path, newline="") as f:
+            return cls.from_rows(csv.DictReader(f))
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    @property
+    def names(self):
+        return list(self.index)
+
+    def __getitem__(self, name):
+        """Properties of one component as a dict of floats (PROPERTY_FIELDS and KAPPA_FIELDS)."""
+        row = self.records[self.index[name]]
+        return {field: float(row[field]) for field in PROPERTY_FIELDS + KAPPA_FIELDS}
+
+    def indices(self, names):
+        """Row indices of the given component names as an int array."""
+        return np.array([self.index[name] for name in names], dtype=np.intp)
+
+    def take(self, indices=None, fields=PROPERTY_FIELDS + KAPPA_FIELDS, extra_dims=0):
+        """
+        Gather rows into a dict of property arrays.
+
+        Parameters:
+            indices (array-like): Row indices or names, defaults to every component
+            fields (tuple): Columns to gather
+            extra_dims (int): Number of trailing singleton axes to append, as in
+                Utility.component_arrays.stack_components
+
+        Returns:
+            dict: Field -> float64 array of shape (len(indices),) + (1,) * extra_dims
+        """
+        if indices is None:
+            rows = self.records
+        else:
+            indices = np.asarray(indices)
+            if indices.dtype.kind in "US":
+                indices = self.indices(indices.tolist())
+            rows = self.records[indices]
+        shape = (len(rows),) + (1,) * extra_dims
+        return {field: np.ascontiguousarray(rows[field]).reshape(shape) for field in fields}
+
+    def update(self, name, **values):
+        """
+        Overwrite columns of one component, e.g. with fitted Antoine constants
+        or kappa slopes: registry.update("C3", A=4.1, kappa_srk=0.71).
+        """
+        unknown = set(values) - set(PROPERTY_FIELDS + KAPPA_FIELDS)
+        if unknown:
+            raise ValueError(f"unknown fields {sorted(unknown)}")
+        row = self.index[name]
+        for field, value in values.items():
+            self.records[field][row] = float(value)
+
+    def save(self, path):
+        """Write every component to a CSV file that load() reads back."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("name",) + PROPERTY_FIELDS + KAPPA_FIELDS)
+            for row in self.records:
+                writer.writerow((str(row["name"]),) + tuple(repr(float(row[field]))
+                                                            for field in PROPERTY_FIELDS + KAPPA_FIELDS))
+
+    def to_dict(self):
+        """Name -> property dict for every component, in registry order."""
+        return {name: self[name] for name in self.index}
+
+
+default_registry = ComponentRegistry.load()
+
+# Name -> properties view of the default registry, the layout the solvers take
+antoine_constants = default_registry.to_dict()
@@ -0,0 +1,131 @@
+import numpy as np
+from fitting.least_squares import levenberg_marquardt
+
+ANTOINE_FIELDS = ("A", "B", "C")
+EXTENDED_ANTOINE_FIELDS = ("A", "B", "C", "D", "E")
+
+
+def pad_series(series):
+    """
+    Stack (T, P) series of different lengths into NaN-padded arrays.
+
+    Parameters:
+        series (list): (T, P) pairs of 1-D arrays, one per component
+
+    Returns:
+        tuple: (T, P) arrays of shape (n_components, longest series)
+    """
+    length = max(np.size(T) for T, _ in series)
+    T_padded = np.full((len(series), length), np.nan)
+    P_padded = np.full((len(series), length), np.nan)
+    for row, (T, P) in enumerate(series):
+        T_padded[row, :np.size(T)] = T
+        P_padded[row, :np.size(P)] = P
+    return T_padded, P_padded
+
+
+def antoine_model(theta, T):
+    """
+    log10(P in bar) of the (extended) Antoine equation and its analytic Jacobian.
+
+    Parameters:
+        theta (ndarray): Constants (A, B, C[, D, E]) per row, shape (n, 3) or (n, 5)
+        T (ndarray): Temperatures in Kelvin, shape (n, m)
+
+    Returns:
+        tuple: (log10_P of shape (n, m), Jacobian of shape (n, m, p))
+    """
+    A, B, C = theta[:, 0:1], theta[:, 1:2], theta[:, 2:3]
+    inverse = 1 / (T + C)
+    log10_P = A - B * inverse
+    columns = [np.ones_like(T), -inverse, B * inverse ** 2]
+    if theta.shape[1] == 5:
+        log10_P = log10_P + theta[:, 3:4] * T + theta[:, 4:5] * np.log10(T)
+        columns += [T, np.log10(T)]
+    return log10_P, np.stack(columns, axis=-1)
+
+
+def _initial_guess(T, log10_P, valid, extended, n_grid=41):
+    # Every constant but C enters linearly: scan C, solve the linear least squares for the rest, keep the best
+    T_min = np.min(np.where(valid, T, np.inf), axis=1)
+    best = np.full((T.shape[0], 5 if extended else 3), np.nan)
+    best_cost = np.full(T.shape[0], np.inf)
+    weight = valid.astype(float)
+    for fraction in np.linspace(-0.9, 0.5, n_grid):
+        C = fraction * T_min[:, None]
+        columns = [np.ones_like(T), -1 / (T + C)]
+        if extended:
+            columns += [T, np.log10(T)]
+        X = np.stack(columns, axis=-1) * weight[..., None]
+        y = log10_P * weight
+        XTX = np.einsum("nmi,nmj->nij", X, X) + 1e-12 * np.eye(X.shape[-1])
+        coefficients = np.linalg.solve(XTX, np.einsum("nmi,nm->ni", X, y)[..., None])[..., 0]
+        cost = np.sum((np.einsum("nmi,ni->nm", X, coefficients) - y) ** 2, axis=1)
+        better = cost < best_cost
+        best_cost = np.where(better, cost, best_cost)
+        theta = np.concatenate([coefficients[:, :2], C, coefficients[:, 2:]], axis=1)
+        best = np.where(better[:, None], theta, best)
+    return best
+
+
+def fit_antoine(T, P, extended=False, tolerance=1e-12, max_iter=200):
+    """
+    Fit Antoine constants log10(P/bar) = A - B/(T + C) to saturation data,
+    or the extended form with + D*T + E*log10(T) (see
+    Antoine_equation.antoine.extended_antoine_equation).
+
+    Every row of T and P is an independent data set, so many components are
+    fitted in one batch: the starting point comes from a scan over C with
+    the remaining constants solved linearly, then all rows are refined
+    together by fitting.least_squares.levenberg_marquardt with the analytic
+    Jacobian of antoine_model. Residuals are in log10(P), i.e. relative
+    errors, and T + C is kept positive over each row's data.
+
+    Parameters:
+        T (ndarray): Temperatures in Kelvin, shape (m,) or (n, m); NaN marks padding
+        P (ndarray): Saturation pressures in Pa, same shape as T; NaN marks padding
+        extended (bool): Fit the extended equation (D and E) as well
+        tolerance (float): Relative step and cost tolerance
+        max_iter (int): Maximum number of iterations
+
+    Returns:
+        dict: One array per constant ("A", "B", "C"[, "D", "E"]) for P in bar
+        and T in K, plus "rms" (of log10(P)), "max_relative_error",
+        "n_points", "iterations" and "converged"; scalars for 1-D input
+    """
+    single = np.ndim(T) == 1
+    T = np.atleast_2d(np.asarray(T, dtype=float))
+    P = np.atleast_2d(np.asarray(P, dtype=float))
+    valid = np.isfinite(T) & np.isfinite(P) & (T > 0) & (P > 0)
+    n_points = valid.sum(axis=1)
+    if np.any(n_points < (5 if extended else 3)):
+        raise ValueError("every data set needs at least as many points as fitted constants")
+
+    # Padding takes a real temperature of its row so that T + C stays positive there too
+    T_min = np.min(np.where(valid, T, np.inf), axis=1)
+    T = np.where(valid, T, T_min[:, None])
+    log10_P = np.where(valid, np.log10(np.where(valid, P, 1.0) / 1e5), 0.0)
+
+    def evaluate(theta):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            model, jacobian = antoine_model(theta, T)
+        return np.where(valid, model - log10_P, 0.0), np.where(valid[..., None], jacobian, 0.0)
+
+    def feasible(theta):
+        return theta[:, 2] + T_min > 0
+
+    result = levenberg_marquardt(evaluate, _initial_guess(T, log10_P, valid, extended), feasible, tolerance, max_iter)
+
+    residual, _ = evaluate(result["theta"])
+    fields = EXTENDED_ANTOINE_FIELDS if extended else ANTOINE_FIELDS
+    fit = {field: result["theta"][:, i] for i, field in enumerate(fields)}
+    fit.update({
+        "rms": np.sqrt(np.sum(residual ** 2, axis=1) / n_points),
+        "max_relative_error": np.max(np.abs(10 ** residual - 1), axis=1),
+        "n_points": n_points,
+        "iterations": result["iterations"],
+        "converged": result["converged"],
+    })
+    if single:
+        fit = {key: value[0].item() for key, value in fit.items()}
+    return fit
@@ -0,0 +1,149 @@
+"""
+Calibrate the component registry against saturation data.
+
+    python -m fitting.calibrate -o fitted.csv                         # Antoine seeds refitted to the SRK curves
+    python -m fitting.calibrate --data psat.csv --kappa -o fitted.csv # Antoine and kappa fitted to measured data
+
+Data files are CSV with columns name, T (K) and P_sat (Pa). The output is
+a components CSV that ComponentRegistry.load reads back.
+"""
+import argparse
+import csv
+import sys
+from collections import defaultdict
+
+import numpy as np
+from components.registry import ComponentRegistry, DEFAULT_PATH
+from fitting.antoine_fit import ANTOINE_FIELDS, fit_antoine, pad_series
+from fitting.eos_fit import KAPPA_MODELS, fit_kappa
+from saturation.psat_solver import solve_saturation_pressure
+
+
+def load_saturation_data(path):
+    """
+    Read (T, P_sat) data from a CSV file with columns name, T (K) and P_sat (Pa).
+
+    Returns:
+        dict: Component name -> (T, P_sat) arrays, in file order
+    """
+    data = defaultdict(lambda: ([], []))
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            T, P = data[row["name"]]
+            T.append(float(row["T"]))
+            P.append(float(row["P_sat"]))
+    return {name: (np.array(T), np.array(P)) for name, (T, P) in data.items()}
+
+
+def eos_saturation_data(registry, names=None, eos_list=("srk", "pr"), T_min=70.0, Tr_max=0.98, n_points=60):
+    """
+    Saturation curves of the EOS themselves as fitting data, every component
+    and EOS solved in one call per EOS.
+
+    Temperatures run from T_min to Tr_max * T_c for each component; points
+    where an EOS does not converge are NaN.
+
+    Returns:
+        tuple: (T, P_sat) arrays of shape (n_components, len(eos_list) * n_points)
+    """
+    components = registry.take(names, extra_dims=1)
+    T = T_min + (Tr_max * components["T_c"] - T_min) * np.linspace(0, 1, n_points)
+    curves = []
+    for eos in eos_list:
+        P_sat, _, converged = solve_saturation_pressure(T, components, eos)
+        curves.append(np.where(converged, P_sat, np.nan))
+    return np.tile(T, len(eos_list)), np.concatenate(curves, axis=1)
+
+
+def calibrate_antoine(registry, names=None, data=None, eos_list=("srk",), update=True, **data_options):
+    """
+    Refit the Antoine constants of many components in one batch.
+
+    Without data the constants are fitted to the EOS saturation curves
+    (eos_saturation_data), which makes the Antoine seed land close to the
+    solution the solvers converge to. SRK and PR curves differ by up to two
+    decades at low reduced temperature, so one set of constants seeds one
+    EOS well; pooling several in eos_list fits a compromise.
+
+    Parameters:
+        registry (ComponentRegistry): Components to fit; updated in place when update is True
+        names (list): Components to fit, defaults to every component (or every one in data)
+        data (dict): Name -> (T, P_sat) measured data, see load_saturation_data
+        eos_list (tuple): EOS whose curves are fitted when no data is given
+        update (bool): Store the fitted A, B and C in the registry
+        **data_options: Passed to eos_saturation_data
+
+    Returns:
+        dict: Component name -> fit result of fitting.antoine_fit.fit_antoine
+    """
+    if data is None:
+        names = registry.names if names is None else list(names)
+        T, P = eos_saturation_data(registry, names, eos_list, **data_options)
+    else:
+        names = list(data) if names is None else list(names)
+        T, P = pad_series([data[name] for name in names])
+
+    fit = fit_antoine(T, P)
+    results = {name: {key: values[i].item() for key, values in fit.items()} for i, name in enumerate(names)}
+    if update:
+        for name, result in results.items():
+            registry.update(name, **{field: result[field] for field in ANTOINE_FIELDS})
+    return results
+
+
+def calibrate_kappa(registry, data, eos="srk", names=None, update=True):
+    """
+    Fit the SRK or PR alpha-function slope of many components to measured data in one batch.
+
+    Returns:
+        dict: Component name -> fit result of fitting.eos_fit.fit_kappa
+    """
+    names = list(data) if names is None else list(names)
+    T, P = pad_series([data[name] for name in names])
+    fit = fit_kappa(T, P, registry.take(names), eos)
+    results = {name: {key: values[i].item() for key, values in fit.items()} for i, name in enumerate(names)}
+    if update:
+        field, _ = KAPPA_MODELS[eos]
+        for name, result in results.items():
+            registry.update(name, **{field: result["kappa"]})
+    return results
+
+
+def print_results(title, results, stream):
+    stream.write(f"{title}\n{'component':<10}{'rms':>12}{'max rel err':>14}{'iterations':>12}  converged\n")
+    for name, result in results.items():
+        stream.write(f"{name:<10}{result['rms']:>12.3e}{result['max_relative_error']:>14.3e}"
+                     f"{result['iterations']:>12}  {result['converged']}\n")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fit Antoine constants and SRK/PR kappa slopes.")
+    parser.add_argument("--components", default=DEFAULT_PATH, help="components file to start from (CSV or JSON)")
+    parser.add_argument("--data", default=None, help="CSV of measured data (name, T in K, P_sat in Pa)")
+    parser.add_argument("--eos", nargs="+", choices=("srk", "pr"), default=["srk"],
+                        help="EOS curves fitted without --data, EOS whose kappa is fitted with --kappa (default: srk)")
+    parser.add_argument("--kappa", action="store_true", help="also fit kappa to the --data")
+    parser.add_argument("--output", "-o", default=None, help="write the fitted components CSV here")
+    args = parser.parse_args(argv)
+    if args.kappa and args.data is None:
+        parser.error("--kappa needs --data")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    registry = ComponentRegistry.load(args.components)
+    data = None if args.data is None else load_saturation_data(args.data)
+
+    print_results("Antoine", calibrate_antoine(registry, data=data, eos_list=tuple(args.eos)), sys.stdout)
+    if args.kappa:
+        for eos in args.eos:
+            print_results(f"kappa ({eos})", calibrate_kappa(registry, data, eos), sys.stdout)
+
+    if args.output:
+        registry.save(args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import numpy as np
+from components.registry import peng_robinson_kappa, srk_kappa
+from Utility.cubic_solver import z_roots
+from fitting.least_squares import levenberg_marquardt
+from saturation.psat_solver import solve_saturation_pressure
+from saturation.residual import antoine_pressure, reduced_coefficients
+
+# EOS name -> (component field holding the alpha slope, omega correlation used when it is absent)
+KAPPA_MODELS = {
+    "srk": ("kappa_srk", srk_kappa),
+    "pr": ("kappa_pr", peng_robinson_kappa),
+}
+
+# Residual, in ln(P), charged for a data point where the EOS has no saturation pressure
+FAILED_RESIDUAL = 1.0
+
+
+def eos_kappa(component, eos="srk"):
+    """Alpha-function slope the EOS uses for this component: the fitted value if present, else the correlation."""
+    field, correlation = KAPPA_MODELS[eos]
+    return component[field] if field in component else correlation(component["omega"])
+
+
+def saturation_kappa_sensitivity(T, P_sat, component, eos="srk"):
+    """
+    Analytic d ln(P_sat)/d kappa along the saturation curve.
+
+    At saturation g = ln(phi_L) - ln(phi_V) = 0. Along it
+    dg = (Z_L - Z_V) d ln(P) + (dg/d ln a) d ln(a) = 0, where
+    d ln(phi)/d ln(a) = -A/(2*sqrt2*B) * ln((Z + (1 + sqrt2)B)/(Z + (1 - sqrt2)B))
+    at fixed T and P, and ln(a) depends on kappa through
+    d ln(a)/d kappa = 2*(1 - sqrt(Tr))/(1 + kappa*(1 - sqrt(Tr))).
+    One cubic solve at the converged pressure gives the whole derivative.
+
+    Parameters:
+        T (ndarray): Temperatures in Kelvin
+        P_sat (ndarray): Saturation pressures of the EOS at T, in Pa
+        component (dict): Component properties, scalars or arrays
+        eos (str): "srk" or "pr"
+
+    Returns:
+        ndarray: d ln(P_sat)/d kappa; NaN where P_sat is NaN or single-root
+    """
+    A1, B1 = reduced_coefficients(T, component, eos)
+    A = A1 * P_sat
+    B = B1 * P_sat
+    Z_liquid, Z_vapor, three_real = z_roots(A, B)
+    sqrt2 = np.sqrt(2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        log_terms = [np.log((Z + (1 + sqrt2) * B) / (Z + (1 - sqrt2) * B)) for Z in (Z_liquid, Z_vapor)]
+        dg_dln_a = -A / (2 * sqrt2 * B) * (log_terms[0] - log_terms[1])
+        one_minus_sqrt_Tr = 1 - np.sqrt(np.asarray(T) / component["T_c"])
+        dln_a_dkappa = 2 * one_minus_sqrt_Tr / (1 + eos_kappa(component, eos) * one_minus_sqrt_Tr)
+        sensitivity = -dg_dln_a * dln_a_dkappa / (Z_liquid - Z_vapor)
+    return np.where(three_real, sensitivity, np.nan)
+
+
+def fit_kappa(T, P, components, eos="srk", tolerance=1e-10, max_iter=50, **solver_options):
+    """
+    Fit the alpha-function slope kappa of SRK or PR to saturation data.
+
+    Each row is one component. Every iteration solves the EOS saturation
+    pressure at all data temperatures of all rows in one
+    solve_saturation_pressure call, warm-started from the previous
+    solution, and linearizes with saturation_kappa_sensitivity. The batch
+    is refined by fitting.least_squares.levenberg_marquardt on the ln(P)
+    residuals. Data above the EOS critical temperature counts with
+    FAILED_RESIDUAL.
+
+    Parameters:
+        T (ndarray): Temperatures in Kelvin, shape (m,) or (n, m); NaN marks padding
+        P (ndarray): Saturation pressures in Pa, same shape as T; NaN marks padding
+        components (dict): One component dict, or property arrays of shape (n,)
+            such as ComponentRegistry.take returns
+        eos (str): "srk" or "pr"
+        tolerance (float): Relative step and cost tolerance
+        max_iter (int): Maximum number of iterations
+        **solver_options: Passed to solve_saturation_pressure
+
+    Returns:
+        dict: "kappa" (the value to store in the component's kappa_srk or
+        kappa_pr field), "rms" (of ln(P)), "max_relative_error", "iterations"
+        and "converged"; scalars for 1-D input
+    """
+    single = np.ndim(T) == 1
+    T = np.atleast_2d(np.asarray(T, dtype=float))
+    P = np.atleast_2d(np.asarray(P, dtype=float))
+    components = {key: np.reshape(value, (-1, 1)) for key, value in components.items()}
+    valid = np.isfinite(T) & np.isfinite(P) & (T > 0) & (P > 0)
+    T = np.where(valid, T, np.nan)
+    ln_P = np.log(np.where(valid, P, 1.0))
+    field, _ = KAPPA_MODELS[eos]
+    state = {"P": antoine_pressure(T, components)}
+
+    def evaluate(theta):
+        component = dict(components, **{field: theta[:, :1]})
+        P_sat, _, converged = solve_saturation_pressure(T, component, eos, P0=state["P"], tolerance=tolerance,
+                                                        **solver_options)
+        ok = valid & converged
+        state["P"] = np.where(ok, P_sat, state["P"])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            residual = np.where(ok, np.log(P_sat) - ln_P, np.where(valid, FAILED_RESIDUAL, 0.0))
+            jacobian = np.where(ok, saturation_kappa_sensitivity(T, P_sat, component, eos), 0.0)
+        return residual, np.nan_to_num(jacobian)[..., None]
+
+    theta0 = np.broadcast_to(eos_kappa(components, eos), (T.shape[0], 1)).astype(float)
+    result = levenberg_marquardt(evaluate, theta0, tolerance=tolerance, max_iter=max_iter)
+
+    residual, _ = evaluate(result["theta"])
+    n_points = np.maximum(valid.sum(axis=1), 1)
+    fit = {
+        "kappa": result["theta"][:, 0],
+        "rms": np.sqrt(np.sum(residual ** 2, axis=1) / n_points),
+        "max_relative_error": np.max(np.abs(np.expm1(residual)), axis=1),
+        "iterations": result["iterations"],
+        "converged": result["converged"],
+    }
+    if single:
+        fit = {key: value[0].item() for key, value in fit.items()}
+    return fit
@@ -0,0 +1,73 @@
+import numpy as np
+
+
+def levenberg_marquardt(evaluate, theta0, feasible=None, tolerance=1e-10, max_iter=100, damping=1e-3):
+    """
+    Levenberg-Marquardt for a batch of independent least-squares problems.
+
+    Every problem (one component, say) has its own parameters, damping and
+    convergence flag, but all of them are advanced together: each iteration
+    makes one call of evaluate for the whole batch and solves the damped
+    normal equations (J^T J + lambda * diag(J^T J)) step = -J^T r as one
+    stacked np.linalg.solve. A trial step is accepted where it lowers the
+    sum of squared residuals (lambda shrinks tenfold) and rejected elsewhere
+    (lambda grows tenfold); the accepted evaluation is reused as the next
+    linearization, so an iteration costs one evaluation.
+
+    Parameters:
+        evaluate (callable): theta (n, p) -> (r, J) with residuals r of shape
+            (n, m) and their analytic Jacobian J of shape (n, m, p). Missing
+            data points should have zero residual and zero Jacobian rows.
+        theta0 (ndarray): Initial parameters, shape (n, p)
+        feasible (callable): Optional theta (n, p) -> (n,) bool; infeasible
+            trial steps are rejected like steps that raise the cost
+        tolerance (float): Converged when the relative step and the relative
+            cost decrease both fall below this
+        max_iter (int): Maximum number of iterations
+        damping (float): Initial lambda
+
+    Returns:
+        dict: "theta" (n, p), "cost" (n,) half the sum of squared residuals,
+        "iterations" (n,) and "converged" (n,) arrays
+    """
+    theta = np.array(theta0, dtype=float)
+    n, p = theta.shape
+    r, J = evaluate(theta)
+    cost = 0.5 * np.einsum("nm,nm->n", r, r)
+    damping = np.full(n, damping)
+    iterations = np.zeros(n, dtype=int)
+    converged = np.zeros(n, dtype=bool)
+    identity = np.eye(p)
+
+    for _ in range(max_iter):
+        active = ~converged
+        if not active.any():
+            break
+        JTJ = np.einsum("nmi,nmj->nij", J, J)
+        gradient = np.einsum("nmi,nm->ni", J, r)
+        diagonal = np.maximum(np.einsum("nii->ni", JTJ), np.finfo(float).tiny)
+        system = JTJ + damping[:, None, None] * diagonal[:, :, None] * identity
+        step = -np.linalg.solve(system, gradient[..., None])[..., 0]
+        step[~active] = 0.0
+
+        trial = theta + step
+        r_trial, J_trial = evaluate(trial)
+        cost_trial = 0.5 * np.einsum("nm,nm->n", r_trial, r_trial)
+        accept = active & np.isfinite(cost_trial) & (cost_trial <= cost)
+        if feasible is not None:
+            accept &= feasible(trial)
+
+        decrease = np.where(accept, cost - cost_trial, 0.0)
+        small_step = np.all(np.abs(step) <= tolerance * (np.abs(theta) + tolerance), axis=1)
+        small_decrease = decrease <= tolerance * np.maximum(cost, np.finfo(float).tiny)
+
+        theta = np.where(accept[:, None], trial, theta)
+        r = np.where(accept[:, None], r_trial, r)
+        J = np.where(accept[:, None, None], J_trial, J)
+        cost = np.where(accept, cost_trial, cost)
+        damping = np.where(accept, damping / 10, damping * 10)
+        iterations += active
+        # A step too small to matter ends the fit, accepted or not; so does damping that stops all movement
+        converged |= active & ((accept & small_decrease) | small_step | (damping > 1e12))
+
+    return {"theta": theta, "cost": cost, "iterations": iterations, "converged": converged}
@@ -1,118 +1,91 @@
-import numpy as np
-import matplotlib.pyplot as plt
-from Antoine_equation.antoine import antoine_equation
-from srk_eos.srk_eos import srk_eos, srk_fugacity_coefficient
-from newthon_raphson.newton_raphson import newton_raphson
-from Utility.fv_calculator import fv_calculator
-from Utility.fl_calculator import fl_calculator
-from peng_robinson.peng_robinson import peng_robinson, peng_robinson_fugacity_coefficient
-
-# J·mol^−1·K^−1
-R = 8.3144598
-
-antoine_constants = {
-    "C1": {"A": 3.9895, "B": 443.028, "C": -0.49, "T_c": 190.6, "P_c": 46.1, "omega": 0.011},
-    "C3": {"A": 4.01158, "B": 834.26, "C": -22.763, "T_c": 369.9, "P_c": 42.5, "omega": 0.152},
-    "C5": {"A": 3.9892, "B": 1070.617, "C": -40.454, "T_c": 469.8, "P_c": 33.6, "omega": 0.249},
-    "C7": {"A": 4.81803, "B": 1635.409, "C": -27.338, "T_c": 540, "P_c": 27.4, "omega": 0.302},
-    "H2O": {"A": 4.6543, "B": 1435.264, "C": -64.848, "T_c": 647, "P_c": 220.64, "omega": 0.344},
-}
-
-def calculate_vapor_pressure(component, T_min, T_max):
-    temperatures_f = []
-    vapor_pressures_psi = []
+import argparse
+import csv
+import json
+import sys
 
-    for t in range(T_min, T_max):
-        # Calculate SRK parameters and vapor pressure
-        P_sat = antoine_equation(antoine_constants[component]["A"],
-                                 antoine_constants[component]["B"],
-                                 antoine_constants[component]["C"],
-                                 t) * 1e5  # Convert to Pascals
+import numpy as np
+from components.registry import antoine_constants
+from saturation.continuation import continuation_curve
+from saturation.disk_cache import cached_saturation_curve
+from saturation.psat_solver import saturation_curve
 
-        Z_factors, A, B = srk_eos(t, P_sat, antoine_constants[component])
+EOS_TITLES = {"srk": "SRK", "pr": "Peng-Robinson"}
 
-        # Vapor and saturated liquid Z factors
-        Z_vapor = max(Z_factors)  # Choose the root closest to 1 for vapor phase
-        Z_sat = max(Z_factors)  # Choose the root closest to 0 for liquid phase (saturated)
+OUTPUT_COLUMNS = ("component", "eos", "T_K", "T_F", "P_sat_Pa", "P_sat_psi", "iterations", "converged")
 
-        # Fugacity coefficients for vapor and saturated liquid
-        phi_vapor = srk_fugacity_coefficient(Z_vapor, A, B)
-        phi_sat = srk_fugacity_coefficient(Z_sat, A, B)
 
-        fv = fv_calculator(phi_vapor, P_sat)
-        fl = fl_calculator(Z_sat, P_sat, P_sat, phi_sat, R, t)
+def _sweep(component, T_min, T_max, eos, T_step=1, use_cache=True, continuation=False):
+    # March up the curve seeding each point from the previous ones
+    if continuation:
+        return continuation_curve(antoine_constants[component], eos, T_min, T_max, T_step)
 
-        # Root finding for SRK fugacity correction
-        root_P = (newton_raphson(srk_eos, srk_fugacity_coefficient, R, P_sat, t, antoine_constants[component], fv, fl)
-                  * 1e-5)  # Convert to bar
+    temperatures = np.arange(T_min, T_max, T_step, dtype=float)
 
-        # Convert bar to psi
-        vapor_pressure_psi = root_P * 14.5038
+    # Solve every temperature of the sweep at once, or reuse the curve cached on disk by an earlier run
+    if use_cache:
+        return cached_saturation_curve(temperatures, antoine_constants[component], eos, name=component)
+    return saturation_curve(temperatures, antoine_constants[component], eos)
 
-        # Convert Kelvin to Fahrenheit
-        temperature_f = (t - 273.15) * 9 / 5 + 32
 
-        # Append converted values
-        temperatures_f.append(temperature_f)
-        vapor_pressures_psi.append(vapor_pressure_psi)
+def _saturation_curve(component, T_min, T_max, eos, T_step=1, use_cache=True, continuation=False):
+    return _plot_series(_sweep(component, T_min, T_max, eos, T_step, use_cache, continuation))
 
-    return temperatures_f, vapor_pressures_psi
 
+def _plot_series(curve):
+    # Leave gaps in the curve where the solver did not converge
+    P_sat = np.where(curve["converged"] > 0, curve["P_sat"], np.nan)
 
-def calculate_vapor_pressure1(component, T_min, T_max):
-    temperatures_f = []
-    vapor_pressures_psi = []
+    # Convert Pa to psi and Kelvin to Fahrenheit
+    vapor_pressures_psi = P_sat * 1e-5 * 14.5038
+    temperatures_f = (np.asarray(curve["T"]) - 273.15) * 9 / 5 + 32
 
-    for t in range(T_min, T_max):
-        # Calculate SRK parameters and vapor pressure
-        P_sat = antoine_equation(antoine_constants[component]["A"],
-                                 antoine_constants[component]["B"],
-                                 antoine_constants[component]["C"],
-                                 t) * 1e5  # Convert to Pascals
+    return temperatures_f.tolist(), vapor_pressures_psi.tolist()
 
-        Z_factors = peng_robinson(t, P_sat, antoine_constants[component])
-        print(Z_factors)
 
-        # Vapor and saturated liquid Z factors
-        Z_vapor = Z_factors['Z_vapor']  # Choose the root closest to 1 for vapor phase
-        Z_sat = Z_factors['Z_vapor']  # Choose the root closest to 0 for liquid phase (saturated)
+def calculate_vapor_pressure(component, T_min, T_max):
+    return _saturation_curve(component, T_min, T_max, "srk")
 
-        # Fugacity coefficients for vapor and saturated liquid
-        phi_vapor = peng_robinson_fugacity_coefficient(t, P_sat, Z_vapor, antoine_constants[component])
-        phi_sat = peng_robinson_fugacity_coefficient(t, P_sat, Z_sat, antoine_constants[component])
 
-        fv = fv_calculator(phi_vapor, P_sat)
-        fl = fl_calculator(Z_sat, P_sat, P_sat, phi_sat, R, t)
+def calculate_vapor_pressure1(component, T_min, T_max):
+    return _saturation_curve(component, T_min, T_max, "pr")
 
-        # Root finding for SRK fugacity correction
-        root_P = (newton_raphson(srk_eos, srk_fugacity_coefficient, R, P_sat, t, antoine_constants[component], fv, fl)
-                  * 1e-5)  # Convert to bar
 
-        # Convert bar to psi
-        vapor_pressure_psi = root_P * 14.5038
+def output_rows(component, eos, T_min, T_max, T_step, use_cache=True, continuation=False):
+    return curve_rows(component, eos, _sweep(component, T_min, T_max, eos, T_step, use_cache, continuation))
 
-        # Convert Kelvin to Fahrenheit
-        temperature_f = (t - 273.15) * 9 / 5 + 32
 
-        # Append converted values
-        temperatures_f.append(temperature_f)
-        vapor_pressures_psi.append(vapor_pressure_psi)
+def curve_rows(component, eos, curve):
+    for T, P_sat, iterations, converged in zip(curve["T"], curve["P_sat"], curve["iterations"], curve["converged"]):
+        converged = bool(converged)
+        yield {"component": component, "eos": eos, "T_K": float(T), "T_F": (float(T) - 273.15) * 9 / 5 + 32,
+               "P_sat_Pa": float(P_sat) if converged else None,
+               "P_sat_psi": float(P_sat) * 1e-5 * 14.5038 if converged else None,
+               "iterations": int(iterations), "converged": converged}
 
-    return temperatures_f, vapor_pressures_psi
 
+def write_output(rows, output_format, stream):
+    if output_format == "csv":
+        writer = csv.DictWriter(stream, fieldnames=OUTPUT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    elif output_format == "json":
+        json.dump(list(rows), stream, indent=2)
+        stream.write("\n")
+    else:
+        stream.write(f"{'component':<10}{'eos':<5}{'T (K)':>10}{'T (°F)':>12}{'P_sat (psi)':>16}\n")
+        for row in rows:
+            P_psi = "not converged" if row["P_sat_psi"] is None else f"{row['P_sat_psi']:.6g}"
+            stream.write(f"{row['component']:<10}{row['eos']:<5}{row['T_K']:>10.2f}{row['T_F']:>12.2f}{P_psi:>16}\n")
 
-number = int(input("enter 1 for srk and 2 for peng robin-robinson: "))
 
-if number == 1:
+def plot_curves(curves, eos):
+    # curves maps component name -> solved curve; matplotlib is only imported when a plot is requested
+    import matplotlib.pyplot as plt
 
     # Plot all components
     plt.figure(figsize=(10, 8))
-    for component in antoine_constants:
-        T_min = 70  # Starting temperature in Kelvin
-        T_max = int(antoine_constants[component]["T_c"])  # Critical temperature in Kelvin
-
-        # Calculate vapor pressures for the component
-        temperatures_f, vapor_pressures_psi = calculate_vapor_pressure(component, T_min, T_max)
+    for component, curve in curves.items():
+        temperatures_f, vapor_pressures_psi = _plot_series(curve)
 
         # Plot each component
         plt.plot(temperatures_f, vapor_pressures_psi, label=component)
@@ -120,33 +93,56 @@ if number == 1:
     # Add labels, legend, and title
     plt.xlabel("Temperature (°F)", fontsize=12)
     plt.ylabel("Vapor Pressure (psi)", fontsize=12)
-    plt.title("Vapor Pressure vs. Temperature for All Components SRK", fontsize=14)
+    plt.title(f"Vapor Pressure vs. Temperature for All Components {EOS_TITLES[eos]}", fontsize=14)
     plt.grid(True, linestyle='--', alpha=0.7)
     plt.legend(fontsize=10)
     plt.show()
 
 
-elif number == 2:
-
-    # Plot all components
-    plt.figure(figsize=(10, 8))
-    for component in antoine_constants:
-        T_min = 70  # Starting temperature in Kelvin
-        T_max = int(antoine_constants[component]["T_c"])  # Critical temperature in Kelvin
-
-        # Calculate vapor pressures for the component
-        temperatures_f, vapor_pressures_psi = calculate_vapor_pressure1(component, T_min, T_max)
-
-        # Plot each component
-        plt.plot(temperatures_f, vapor_pressures_psi, label=component)
-
-    # Add labels, legend, and title
-    plt.xlabel("Temperature (°F)", fontsize=12)
-    plt.ylabel("Vapor Pressure (psi)", fontsize=12)
-    plt.title("Vapor Pressure vs. Temperature for All Components Peng-Robinson", fontsize=14)
-    plt.grid(True, linestyle='--', alpha=0.7)
-    plt.legend(fontsize=10)
-    plt.show()
-
-else:
-    raise ValueError("choose 1 or 2")
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Vapor pressure curves from the SRK and Peng-Robinson EOS.")
+    parser.add_argument("--eos", choices=("srk", "pr", "both"), default="both", help="equation of state")
+    parser.add_argument("--components", nargs="+", choices=list(antoine_constants), default=list(antoine_constants),
+                        metavar="NAME", help=f"components to solve (default: all of {', '.join(antoine_constants)})")
+    parser.add_argument("--t-min", type=float, default=70, help="first temperature in K (default: 70)")
+    parser.add_argument("--t-max", type=float, default=None,
+                        help="exclusive upper temperature in K (default: each component's T_c)")
+    parser.add_argument("--t-step", type=float, default=1, help="temperature step in K (default: 1)")
+    parser.add_argument("--format", choices=("table", "csv", "json"), default="table", dest="output_format",
+                        help="output format (default: table)")
+    parser.add_argument("--output", "-o", default=None, help="write results to this file instead of stdout")
+    parser.add_argument("--plot", action="store_true", help="plot the curves with matplotlib")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the on-disk curve cache")
+    parser.add_argument("--continuation", action="store_true",
+                        help="march up in temperature, seeding each point from the previous ones (no cache)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    eos_list = ("srk", "pr") if args.eos == "both" else (args.eos,)
+    use_cache = not args.no_cache
+
+    # Each curve is solved once and kept for the plot
+    curves = {eos: {} for eos in eos_list}
+
+    def rows():
+        for eos in eos_list:
+            for component in args.components:
+                upper = antoine_constants[component]["T_c"] if args.t_max is None else args.t_max
+                curve = _sweep(component, args.t_min, upper, eos, args.t_step, use_cache, args.continuation)
+                curves[eos][component] = curve
+                yield from curve_rows(component, eos, curve)
+
+    if args.output is None:
+        write_output(rows(), args.output_format, sys.stdout)
+    else:
+        with open(args.output, "w", newline="") as stream:
+            write_output(rows(), args.output_format, stream)
+
+    if args.plot:
+        for eos in eos_list:
+            plot_curves(curves[eos], eos)
+
+if __name__ == "__main__":
+    main()
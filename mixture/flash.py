@@ -0,0 +1,272 @@
+import numpy as np
+from mixture.mixture import mixing_rules, mixture_ln_fugacity_coefficients
+
+# Largest tangent plane distance at a stationary point that still counts as stable
+STABILITY_TOLERANCE = 1e-8
+
+# A stationary point closer than this to the feed, in max |ln(w_i/z_i)|, is the trivial one
+TRIVIAL_DISTANCE = 1e-4
+
+# Single-phase states with V/b below this are labelled liquid (Pedersen's volume criterion)
+LIQUID_VOLUME_RATIO = 1.75
+
+
+def rachford_rice(z, K, tolerance=1e-12, max_iter=100):
+    """
+    Solve the Rachford-Rice equation sum z_i (K_i - 1) / (1 + beta (K_i - 1)) = 0
+    for the vapor fraction beta, for many flashes at once.
+
+    The function is monotone decreasing between its asymptotes
+    1/(1 - K_max) < beta < 1/(1 - K_min), so the root is always bracketed
+    there; Newton steps that leave the bracket are replaced by bisection.
+    The root is not clipped to [0, 1] (negative flash): beta <= 0 or >= 1
+    means the K-values predict a single phase.
+
+    Parameters:
+        z (ndarray): Feed mole fractions, shape (m, n)
+        K (ndarray): Equilibrium ratios, shape (m, n)
+        tolerance (float): Absolute tolerance on beta
+        max_iter (int): Maximum number of iterations
+
+    Returns:
+        ndarray: beta of shape (m,). Rows without a root (all K on one side of
+        one) get -inf (all K < 1, liquid) or +inf (all K > 1, vapor).
+    """
+    K_minus_1 = K - 1
+    K_max = K.max(axis=-1)
+    K_min = K.min(axis=-1)
+    two_sided = (K_max > 1) & (K_min < 1)
+
+    with np.errstate(divide="ignore"):
+        low = np.where(two_sided, 1 / (1 - K_max), 0.0)
+        high = np.where(two_sided, 1 / (1 - K_min), 1.0)
+    beta = 0.5 * (low + high)
+
+    active = np.flatnonzero(two_sided)
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        b = beta[active]
+        km1 = K_minus_1[active]
+        denominator = 1 + b[:, None] * km1
+        with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+            g = np.sum(z[active] * km1 / denominator, axis=-1)
+            dg = -np.sum(z[active] * km1 ** 2 / denominator ** 2, axis=-1)
+            step = b - g / dg
+
+        # g decreases with beta: a positive g puts the root above b
+        lo = np.where(g > 0, b, low[active])
+        hi = np.where(g > 0, high[active], b)
+        low[active], high[active] = lo, hi
+
+        inside = (step > lo) & (step < hi)
+        b_new = np.where(inside, step, 0.5 * (lo + hi))
+        beta[active] = b_new
+        active = active[np.abs(b_new - b) > tolerance]
+
+    beta = np.where(two_sided, beta, np.where(K_max <= 1, -np.inf, np.inf))
+    return beta
+
+
+def _phase_compositions(z, K, beta):
+    # Inside (0, 1) use the Rachford-Rice compositions, outside the feed itself is the only phase
+    b = np.clip(beta, 0.0, 1.0)[:, None]
+    x = z / (1 + b * (K - 1))
+    y = K * x
+    return x / x.sum(axis=-1, keepdims=True), y / y.sum(axis=-1, keepdims=True)
+
+
+def _feed_fugacity(z, P, A1_ij, B1):
+    # ln(phi) of the feed on the root with the lower Gibbs energy sum z_i ln(z_i phi_i)
+    ln_phi_L, Z_L = mixture_ln_fugacity_coefficients(z, P, A1_ij, B1, "liquid")
+    ln_phi_V, Z_V = mixture_ln_fugacity_coefficients(z, P, A1_ij, B1, "vapor")
+    use_liquid = np.sum(z * (ln_phi_L - ln_phi_V), axis=-1) < 0
+    return np.where(use_liquid[:, None], ln_phi_L, ln_phi_V), np.where(use_liquid, Z_L, Z_V)
+
+
+def _stability(z, P, A1_ij, B1, ln_K, tolerance, max_iter):
+    # Michelsen's tangent plane test from a vapor-like (z K) and a liquid-like (z / K) trial phase,
+    # both iterated together by successive substitution ln W_i = ln z_i + ln phi_i(z) - ln phi_i(w)
+    m = z.shape[0]
+    ln_z = np.log(np.maximum(z, np.finfo(float).tiny))
+    ln_phi_z, Z = _feed_fugacity(z, P, A1_ij, B1)
+    ln_z2 = np.concatenate([ln_z, ln_z])
+    d = np.concatenate([ln_z + ln_phi_z, ln_z + ln_phi_z])
+    ln_W = ln_z2 + np.concatenate([ln_K, -ln_K])
+    P2 = np.concatenate([P, P])
+    A2 = np.concatenate([A1_ij, A1_ij])
+    B2 = np.concatenate([B1, B1])
+    liquid_trial = np.arange(2 * m) >= m
+
+    iterations = np.zeros(2 * m, dtype=int)
+    trivial = np.zeros(2 * m, dtype=bool)
+    active = np.arange(2 * m)
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        ln_w = ln_W[active] - np.log(np.sum(np.exp(ln_W[active]), axis=-1))[:, None]
+        ln_phi = np.empty_like(ln_w)
+        for phase, rows in (("vapor", ~liquid_trial[active]), ("liquid", liquid_trial[active])):
+            ln_phi[rows] = mixture_ln_fugacity_coefficients(np.exp(ln_w[rows]), P2[active[rows]],
+                                                           A2[active[rows]], B2[active[rows]], phase)[0]
+        ln_W_new = d[active] - ln_phi
+        change = np.max(np.abs(ln_W_new - ln_W[active]), axis=-1)
+        ln_W[active] = ln_W_new
+        iterations[active] += 1
+        # The trial collapsed onto the feed: no other stationary point along this path
+        trivial[active] = np.max(np.abs(ln_w - ln_z2[active]), axis=-1) < TRIVIAL_DISTANCE
+        active = active[~((change < tolerance) | trivial[active] | ~np.isfinite(change))]
+
+    tm = 1 - np.sum(np.exp(ln_W), axis=-1)
+    tm = np.where(trivial | ~np.isfinite(tm), np.inf, tm)
+    tm_vapor, tm_liquid = tm[:m], tm[m:]
+    unstable = np.minimum(tm_vapor, tm_liquid) < -STABILITY_TOLERANCE
+
+    # Flash seed from the more unstable trial: K = W/z against a vapor trial, z/W against a liquid one
+    ln_K_flash = np.where((tm_vapor <= tm_liquid)[:, None], ln_W[:m] - ln_z, ln_z - ln_W[m:])
+    return unstable, np.minimum(tm_vapor, tm_liquid), ln_K_flash, Z, iterations[:m] + iterations[m:]
+
+
+def stability_test(T, P, z, mixture, eos="srk", tolerance=1e-10, max_iter=200):
+    """
+    Tangent plane stability test of feeds at fixed temperature and pressure, batched.
+
+    A feed is unstable, and splits into two phases, when some trial
+    composition w has a negative tangent plane distance
+    tm(w) = 1 + sum W_i (ln W_i + ln phi_i(W) - ln z_i - ln phi_i(z) - 1).
+    The stationary points are searched from a vapor-like and a
+    liquid-like Wilson estimate (Michelsen, 1982); the feed's fugacities
+    are taken on its lower-Gibbs-energy root.
+
+    Parameters:
+        T (float or ndarray): Temperature in Kelvin
+        P (float or ndarray): Pressure in Pa
+        z (ndarray): Feed mole fractions, shape (..., n); T, P and z[..., 0] broadcast together
+        mixture (Mixture): Components and k_ij
+        eos (str): "srk" or "pr"
+        tolerance (float): Tolerance on the largest change of ln W
+        max_iter (int): Maximum number of iterations per trial phase
+
+    Returns:
+        dict: stable, tm (the lowest non-trivial stationary tangent plane
+        distance, inf when both trials fall onto the feed), K (flash seed
+        from the more unstable trial) and Z (feed root), each shaped like the
+        broadcast input
+    """
+    n = len(mixture)
+    T, P, z, shape = _flatten(T, P, z, n)
+    A1_ij, B1 = mixture.coefficients(T, eos)
+    unstable, tm, ln_K, Z, _ = _stability(z, P, A1_ij, B1, np.log(mixture.wilson_k(T, P)), tolerance, max_iter)
+    result = {"stable": ~unstable, "tm": tm, "K": np.exp(ln_K), "Z": Z}
+    return {key: value.reshape(shape + value.shape[1:]) for key, value in result.items()}
+
+
+def _flatten(T, P, z, n):
+    z = np.asarray(z, dtype=float)
+    z = z / z.sum(axis=-1, keepdims=True)
+    T, P, z = np.broadcast_arrays(np.asarray(T, dtype=float)[..., None], np.asarray(P, dtype=float)[..., None], z)
+    return T[..., 0].reshape(-1), P[..., 0].reshape(-1), z.reshape(-1, n), T.shape[:-1]
+
+
+def pt_flash(T, P, z, mixture, eos="srk", tolerance=1e-10, max_iter=200, accelerate=5):
+    """
+    Isothermal two-phase flash at fixed temperature and pressure, batched.
+
+    Every feed first goes through the tangent plane stability test (see
+    stability_test). Stable feeds are single-phase and are labelled liquid
+    or vapor from their root: liquid where V/b < LIQUID_VOLUME_RATIO.
+    Unstable feeds are flashed from the K-values of the stability test:
+    each iteration solves Rachford-Rice for the vapor fraction, evaluates
+    liquid and vapor fugacity coefficients and updates
+    ln K = ln(phi_L) - ln(phi_V) (successive substitution). Every
+    `accelerate` iterations the update is extrapolated with the dominant
+    eigenvalue of the substitution map,
+
+        lambda = (d_k . d_(k-1)) / (d_(k-1) . d_(k-1)),  ln K += d_k lambda / (1 - lambda),
+
+    where d_k is the latest change of ln K; the extrapolation is only taken
+    when 0 < lambda < 1. Flashes that converge drop out of the working set.
+
+    Parameters:
+        T (float or ndarray): Temperature in Kelvin
+        P (float or ndarray): Pressure in Pa
+        z (ndarray): Feed mole fractions, shape (..., n); T, P and z[..., 0] broadcast together
+        mixture (Mixture): Components and k_ij
+        eos (str): "srk" or "pr"
+        tolerance (float): Tolerance on the largest change of ln K
+        max_iter (int): Maximum number of iterations
+        accelerate (int): Iterations between eigenvalue extrapolations, 0 to disable
+
+    Returns:
+        dict: beta (vapor fraction, 0 or 1 for a single phase), x, y, K, Z_liquid,
+        Z_vapor, iterations (of the flash), converged, two_phase, stable and tm
+        (see stability_test), each shaped like the broadcast input (compositions
+        with a trailing component axis)
+    """
+    n = len(mixture)
+    T, P, z, shape = _flatten(T, P, z, n)
+
+    A1_ij, B1 = mixture.coefficients(T, eos)
+    unstable, tm, ln_K, Z_feed, _ = _stability(z, P, A1_ij, B1, np.log(mixture.wilson_k(T, P)), tolerance,
+                                               max_iter)
+    previous_step = np.zeros_like(ln_K)
+    beta = np.zeros(T.size)
+    Z_L = Z_feed.copy()
+    Z_V = Z_feed.copy()
+    iterations = np.zeros(T.size, dtype=int)
+    converged = ~unstable
+    active = np.flatnonzero(unstable)
+
+    for iteration in range(1, max_iter + 1):
+        if active.size == 0:
+            break
+        za, Pa, ln_Ka = z[active], P[active], ln_K[active]
+        Ka = np.exp(ln_Ka)
+        beta_a = rachford_rice(za, Ka)
+        x, y = _phase_compositions(za, Ka, beta_a)
+
+        ln_phi_L, Z_La = mixture_ln_fugacity_coefficients(x, Pa, A1_ij[active], B1[active], "liquid")
+        ln_phi_V, Z_Va = mixture_ln_fugacity_coefficients(y, Pa, A1_ij[active], B1[active], "vapor")
+        step = ln_phi_L - ln_phi_V - ln_Ka
+        iterations[active] += 1
+
+        if accelerate and iteration % accelerate == 0:
+            previous = previous_step[active]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                lam = np.sum(step * previous, axis=-1) / np.sum(previous * previous, axis=-1)
+            use = (lam > 0) & (lam < 1)
+            factor = np.where(use, 1 / (1 - np.where(use, lam, 0.0)), 1.0)
+            ln_K[active] = ln_Ka + step * factor[:, None]
+        else:
+            ln_K[active] = ln_Ka + step
+        previous_step[active] = step
+
+        beta[active] = beta_a
+        Z_L[active] = Z_La
+        Z_V[active] = Z_Va
+        change = np.max(np.abs(step), axis=-1)
+        # Trivial solution: K -> 1, both phases are the feed
+        trivial = np.max(np.abs(ln_K[active]), axis=-1) < TRIVIAL_DISTANCE
+        done = (change < tolerance) | trivial
+        converged[active[done]] = True
+        failed = ~np.isfinite(change)
+        active = active[~(done | failed)]
+
+    K = np.exp(ln_K)
+    trivial = np.max(np.abs(ln_K), axis=-1) < TRIVIAL_DISTANCE
+    two_phase = unstable & converged & (beta > 0) & (beta < 1) & ~trivial
+    x, y = _phase_compositions(z, K, beta)
+    x = np.where(two_phase[:, None], x, z)
+    y = np.where(two_phase[:, None], y, z)
+
+    # Single phase: a flash that converged outside (0, 1) says which side it is on; otherwise the feed root does
+    _, B1_mix, _ = mixing_rules(z, A1_ij, B1)
+    vapor_like = Z_feed / (B1_mix * P) >= LIQUID_VOLUME_RATIO
+    vapor_like = np.where(unstable & converged & ~trivial, beta >= 1, vapor_like)
+    beta = np.where(two_phase, beta, np.where(vapor_like, 1.0, 0.0))
+    Z_L = np.where(two_phase, Z_L, Z_feed)
+    Z_V = np.where(two_phase, Z_V, Z_feed)
+
+    result = {"beta": beta, "x": x, "y": y, "K": K, "Z_liquid": Z_L, "Z_vapor": Z_V, "iterations": iterations,
+              "converged": converged, "two_phase": two_phase, "stable": ~unstable, "tm": tm}
+    return {key: value.reshape(shape + value.shape[1:]) for key, value in result.items()}
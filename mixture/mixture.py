@@ -0,0 +1,243 @@
+import numpy as np
+from components.registry import antoine_constants
+from Utility.component_arrays import stack_components
+from Utility.cubic_solver import z_roots
+from Utility.instrumentation import instrumentation
+from saturation.residual import reduced_coefficients
+
+
+class Mixture:
+    """
+    Components of a mixture with their binary interaction parameters.
+
+    Holds the stacked critical properties (component axis last) and the
+    symmetric k_ij matrix. Pure-component A/P and B/P are computed once per
+    temperature by coefficients(); every mixing sum after that is a matrix
+    product over the component axis.
+
+    Parameters:
+        names (list): Component names, in the order of the composition vectors
+        components (dict): Component name -> properties, defaults to antoine_constants
+        kij (ndarray): Binary interaction parameters, shape (n, n); zeros by default
+    """
+
+    def __init__(self, names, components=None, kij=None):
+        if components is None:
+            components = antoine_constants
+        self.names = list(names)
+        self.properties = stack_components(components, self.names)
+        n = len(self.names)
+        self.kij = np.zeros((n, n)) if kij is None else np.asarray(kij, dtype=float)
+        if self.kij.shape != (n, n):
+            raise ValueError(f"kij must have shape ({n}, {n}), got {self.kij.shape}")
+        if not np.allclose(self.kij, self.kij.T):
+            raise ValueError("kij must be symmetric")
+
+    def __len__(self):
+        return len(self.names)
+
+    def coefficients(self, T, eos="srk"):
+        """
+        Pure-component A_i/P and the cross matrix (A/P)_ij = sqrt(A_i A_j)(1 - k_ij)/P.
+
+        Parameters:
+            T (float or ndarray): Temperature in Kelvin, any shape (...)
+            eos (str): "srk" or "pr"
+
+        Returns:
+            tuple: (A1_ij of shape (..., n, n), B1 of shape (..., n))
+        """
+        A1, B1 = reduced_coefficients(np.asarray(T, dtype=float)[..., None], self.properties, eos)
+        root = np.sqrt(A1)
+        A1_ij = root[..., :, None] * root[..., None, :] * (1 - self.kij)
+        return A1_ij, B1
+
+    def wilson_k(self, T, P):
+        """
+        Wilson's correlation for the equilibrium ratios K_i = y_i/x_i.
+
+        Returns:
+            ndarray: K of shape broadcast(T, P) + (n,)
+        """
+        T = np.asarray(T, dtype=float)[..., None]
+        P = np.asarray(P, dtype=float)[..., None]
+        Tc = self.properties["T_c"]
+        Pc = self.properties["P_c"] * 1e5  # Convert P_c from Bar to Pa
+        return Pc / P * np.exp(5.373 * (1 + self.properties["omega"]) * (1 - Tc / T))
+
+
+def mixing_rules(x, A1_ij, B1):
+    """
+    van der Waals one-fluid mixing rules per unit pressure.
+
+    Parameters:
+        x (ndarray): Mole fractions, shape (..., n)
+        A1_ij (ndarray): Cross attraction matrix per unit pressure, shape (..., n, n)
+        B1 (ndarray): Pure co-volumes per unit pressure, shape (..., n)
+
+    Returns:
+        tuple: (A1_mix, B1_mix, A1_i) where A1_i = sum_j x_j A1_ij
+    """
+    A1_i = np.einsum("...ij,...j->...i", A1_ij, x)
+    A1_mix = np.einsum("...i,...i->...", x, A1_i)
+    B1_mix = np.einsum("...i,...i->...", x, B1)
+    return A1_mix, B1_mix, A1_i
+
+
+def mixture_ln_fugacity_coefficients(x, P, A1_ij, B1, phase="vapor"):
+    """
+    Natural log of the fugacity coefficient of every component in one phase.
+
+    ln(phi_i) = (b_i/b)(Z - 1) - ln(Z - B)
+                - A/(2*sqrt(2)*B) * (2*sum_j x_j a_ij/a - b_i/b) * ln((Z + (1+sqrt(2))B) / (Z + (1-sqrt(2))B))
+
+    With a single component this is exactly the pure-component expression
+    used by srk_ln_fugacity_coefficient and peng_robinson_ln_fugacity_coefficient.
+
+    Parameters:
+        x (ndarray): Phase composition, shape (..., n)
+        P (float or ndarray): Pressure in Pa, shape (...)
+        A1_ij, B1: From Mixture.coefficients
+        phase (str): "liquid" (smallest root) or "vapor" (largest root)
+
+    Returns:
+        tuple: (ln_phi of shape (..., n) clipped to [-700, 700], Z of shape (...))
+    """
+    A1_mix, B1_mix, A1_i = mixing_rules(x, A1_ij, B1)
+    P = np.asarray(P, dtype=float)
+    A = A1_mix * P
+    B = B1_mix * P
+    Z_liquid, Z_vapor, _ = z_roots(A, B)
+    Z = Z_liquid if phase == "liquid" else Z_vapor
+
+    b_ratio = B1 / B1_mix[..., None]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        log_term = np.log((Z + (1 + np.sqrt(2)) * B) / (Z + (1 - np.sqrt(2)) * B))
+        ln_phi = (b_ratio * (Z - 1)[..., None] - np.log(Z - B)[..., None]
+                  - (A / (2 * np.sqrt(2) * B) * log_term)[..., None] * (2 * A1_i / A1_mix[..., None] - b_ratio))
+    if instrumentation.enabled:
+        instrumentation.count("fugacity_evaluations", np.size(Z))
+    return np.clip(ln_phi, -700, 700), Z
+
+
+def mixture_fugacity_coefficients(T, P, x, mixture, eos="srk", phase="vapor"):
+    """
+    Fugacity coefficients of every component of a mixture at (T, P, x).
+
+    Parameters:
+        T (float or ndarray): Temperature in Kelvin
+        P (float or ndarray): Pressure in Pa
+        x (ndarray): Mole fractions, shape (..., n); need not be normalized
+        mixture (Mixture): Components and k_ij
+        eos (str): "srk" or "pr"
+        phase (str): "liquid" or "vapor"
+
+    Returns:
+        tuple: (phi of shape (..., n), Z)
+    """
+    x = np.asarray(x, dtype=float)
+    x = x / x.sum(axis=-1, keepdims=True)
+    A1_ij, B1 = mixture.coefficients(T, eos)
+    ln_phi, Z = mixture_ln_fugacity_coefficients(x, P, A1_ij, B1, phase)
+    return np.exp(ln_phi), Z
+
+
+def _saturation_point(T, z, mixture, eos, kind, P0, tolerance, max_iter):
+    z = np.asarray(z, dtype=float)
+    z = z / z.sum(axis=-1, keepdims=True)
+    T, z = np.broadcast_arrays(np.asarray(T, dtype=float)[..., None], z)
+    T = T[..., 0]
+    shape = T.shape
+    T = T.reshape(-1)
+    z = z.reshape(-1, len(mixture))
+
+    A1_ij, B1 = mixture.coefficients(T, eos)
+
+    # Wilson/Raoult seed: bubble P = sum z_i Psat_i, dew 1/P = sum z_i / Psat_i
+    K_unit = mixture.wilson_k(T, 1.0)
+    if P0 is None:
+        P = np.sum(z * K_unit, axis=-1) if kind == "bubble" else 1.0 / np.sum(z / K_unit, axis=-1)
+    else:
+        P = np.broadcast_to(np.asarray(P0, dtype=float), shape).reshape(-1).copy()
+    K = K_unit / P[:, None]
+
+    other = np.empty_like(z)
+    iterations = np.zeros(T.size, dtype=int)
+    converged = np.zeros(T.size, dtype=bool)
+    active = np.arange(T.size)
+
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        za, Ka, Pa = z[active], K[active], P[active]
+        if kind == "bubble":
+            trial = za * Ka
+        else:
+            trial = za / Ka
+        total = trial.sum(axis=-1)
+        trial = trial / total[:, None]
+        other[active] = trial
+
+        liquid, vapor = (za, trial) if kind == "bubble" else (trial, za)
+        ln_phi_L, Z_L = mixture_ln_fugacity_coefficients(liquid, Pa, A1_ij[active], B1[active], "liquid")
+        ln_phi_V, Z_V = mixture_ln_fugacity_coefficients(vapor, Pa, A1_ij[active], B1[active], "vapor")
+        K_new = np.exp(ln_phi_L - ln_phi_V)
+
+        # Pressure update that drives sum(y) (bubble) or sum(x) (dew) to one
+        if kind == "bubble":
+            S = np.sum(za * K_new, axis=-1)
+            P_new = Pa * S
+        else:
+            S = np.sum(za / K_new, axis=-1)
+            P_new = Pa / S
+
+        iterations[active] += 1
+        K[active] = K_new
+        P[active] = P_new
+        done = (np.abs(S - 1) < tolerance) & (np.max(np.abs(K_new / Ka - 1), axis=-1) < tolerance)
+        # Trivial solution: both phases collapsed onto the same root
+        trivial = np.abs(Z_V - Z_L) < 1e-9 * np.maximum(Z_V, 1.0)
+        converged[active[done & ~trivial]] = True
+        failed = ~np.isfinite(P_new) | (P_new <= 0) | trivial
+        P[active[failed]] = np.nan
+        active = active[~(done | failed)]
+
+    return (P.reshape(shape), other.reshape(shape + (len(mixture),)),
+            iterations.reshape(shape), converged.reshape(shape))
+
+
+def bubble_pressure(T, x, mixture, eos="srk", P0=None, tolerance=1e-8, max_iter=200):
+    """
+    Bubble-point pressure and incipient vapor composition for many liquids at once.
+
+    Successive substitution on K_i = phi_i^L / phi_i^V, seeded with Wilson
+    K-values, with the pressure rescaled by sum(x_i K_i) every iteration.
+    All compositions are solved together; converged ones drop out of the
+    working set.
+
+    Parameters:
+        T (float or ndarray): Temperature in Kelvin, broadcast against x[..., 0]
+        x (ndarray): Liquid mole fractions, shape (..., n)
+        mixture (Mixture): Components and k_ij
+        eos (str): "srk" or "pr"
+        P0 (float or ndarray): Initial pressure in Pa, defaults to the Wilson estimate
+        tolerance (float): Tolerance on |sum(y) - 1| and on the K-value change
+        max_iter (int): Maximum number of iterations
+
+    Returns:
+        tuple: (P_bubble, y, iterations, converged). P is NaN where the iteration
+        diverged or fell onto the trivial solution.
+    """
+    return _saturation_point(T, x, mixture, eos, "bubble", P0, tolerance, max_iter)
+
+
+def dew_pressure(T, y, mixture, eos="srk", P0=None, tolerance=1e-8, max_iter=200):
+    """
+    Dew-point pressure and incipient liquid composition for many vapors at once.
+
+    Same scheme as bubble_pressure with the pressure rescaled by 1/sum(y_i/K_i).
+
+    Returns:
+        tuple: (P_dew, x, iterations, converged)
+    """
+    return _saturation_point(T, y, mixture, eos, "dew", P0, tolerance, max_iter)
@@ -1,118 +1,162 @@
-import numpy as np
-from Utility.fl_calculator import fl_calculator
-from Utility.fv_calculator import fv_calculator
+import logging
 
+import numpy as np
+from Utility.instrumentation import instrumentation
+from Utility.parameter_cache import ParameterCache, parameter_key
+from Utility.phase_identification import envelope_bounds, into_envelope, select_roots
+from srk_eos.srk_eos import srk_fugacity_residual_derivative
 
+logger = logging.getLogger(__name__)
 
-def fugacity_error(fv, fl):
-    """
-    Calculate the absolute error between the vapor and liquid fugacity coefficients.
-    """
-    error = abs(fv - fl)
-    return error
+# Spinodal bounds per (EOS function, component, T) for repeated solves at the same temperature
+envelope_cache = ParameterCache(maxsize=1024)
 
 
-def fugacity_derivative(Z_func, phi_func, R, P, T, component, delta=0.01):
+def fugacity_residual(Z_func, phi_func, P, T, component):
     """
-    Numerically calculate the derivative of a function with respect to pressure (P) or temperature (T).
-
-    Parameters:
-        func (callable): The function whose derivative we want to calculate (e.g., fugacity coefficient).
-        P (float): Current value of pressure.
-        T (float): Current value of temperature.
-        delta (float): A small perturbation for the finite difference.
+    Evaluate ln(phi_L) - ln(phi_V) at pressure P.
 
     Returns:
-        float: The derivative of the function with respect to P or T.
+        tuple: (residual, Z_liquid, Z_vapor)
     """
+    Z_factors, A, B = Z_func(T, P, component)
+    return _residual(phi_func, Z_factors, A, B)
 
-    def fp_calculator(Z_func, phi_func, R, P, T, component):
-        P = P + delta
-        Z_factors, A, B = Z_func(T, P, component)
-
-        Z_vapor = max(Z_factors)  # Choose the root closest to 1 for vapor phase
-        Z_sat = min(Z_factors)  # Choose the root closest to 0 for liquid phase (saturated)
-        print(Z_factors)
-
-
-        phi_vapor = phi_func(Z_vapor, A, B)
-        phi_sat = phi_func(Z_sat, A, B)
-
-
-        print("phi : ", phi_vapor, phi_sat)
-        # print(phi_vapor)
 
-        fv = fv_calculator(phi_vapor, P)
-        fl = fl_calculator(Z_sat, P, P, phi_sat, R, T)
+def _residual(phi_func, Z_factors, A, B):
+    # Largest root for the vapor, smallest root above the co-volume for the liquid
+    Z_sat, Z_vapor, _ = select_roots(Z_factors, B)
 
-        print("ff + :  ", fv, fl)
+    phi_vapor = phi_func(Z_vapor, A, B)
+    phi_sat = phi_func(Z_sat, A, B)
 
-        fp = abs(fv - fl)
-        return fp
+    return np.log(phi_sat) - np.log(phi_vapor), Z_sat, Z_vapor
 
-    def fm_calculator(Z_func, phi_func, R, P, T, component):
-        P = P - delta
 
-        Z_factors, A, B = Z_func(T, P, component)
-
-        Z_vapor = max(Z_factors)  # Choose the root closest to 1 for vapor phase
-        Z_sat = min(Z_factors)  # Choose the root closest to 0 for liquid phase (saturated)
-        print("z - ", Z_factors)
-
-        phi_vapor = phi_func(Z_vapor, A, B)
-        phi_sat = phi_func(Z_sat, A, B)
-
-        fv = fv_calculator(phi_vapor, P)
-        fl = fl_calculator(Z_sat, P, P, phi_sat, R, T)
+def fugacity_derivative(Z_func, phi_func, R, P, T, component, delta=0.01):
+    """
+    Numerically calculate the derivative of ln(phi_L) - ln(phi_V) with respect to pressure (P).
 
-        print("ff - :  ", fv, fl)
-        fm = abs(fv - fl)
-        return fm
+    This is the finite-difference fallback of newton_raphson; it solves the
+    cubic twice per call.
 
-    f_plus_delta = fp_calculator(Z_func, phi_func, R, P, T, component)  # Function value at P + delta
+    Parameters:
+        Z_func (callable): EOS returning (Z_factors, A, B), e.g. srk_eos.
+        phi_func (callable): Fugacity coefficient from (Z, A, B).
+        P (float): Current value of pressure.
+        T (float): Current value of temperature.
+        delta (float): A small perturbation for the finite difference.
 
-    f_minus_delta = fm_calculator(Z_func, phi_func, R, P, T, component)  # Function value at P - delta
+    Returns:
+        float: The derivative of the residual with respect to P.
+    """
 
-    print("f_func", f_plus_delta, f_minus_delta)
+    f_plus_delta, Z_sat, Z_vapor = fugacity_residual(Z_func, phi_func, P + delta, T, component)
+    logger.debug("P + delta: Z_L=%g Z_V=%g residual=%g", Z_sat, Z_vapor, f_plus_delta)
 
+    f_minus_delta, Z_sat, Z_vapor = fugacity_residual(Z_func, phi_func, P - delta, T, component)
+    logger.debug("P - delta: Z_L=%g Z_V=%g residual=%g", Z_sat, Z_vapor, f_minus_delta)
 
-    derivative = f_plus_delta - f_minus_delta / (2 * delta)  # Central difference
+    derivative = (f_plus_delta - f_minus_delta) / (2 * delta)  # Central difference
 
     return derivative
 
 
-def newton_raphson(Z_func, phi_func, R, P, T, component, fv, fl, tolerance=1e-5, max_iter=100):
+def newton_raphson(Z_func, phi_func, R, P, T, component, tolerance=1e-5, max_iter=100, derivative="analytic",
+                   derivative_func=srk_fugacity_residual_derivative):
     """
-    Solve for the root of the function using the Newton-Raphson method.
+    Solve ln(phi_L) = ln(phi_V) for the saturation pressure using the Newton-Raphson method.
 
     Parameters:
-        dfunc (callable): The function whose root we are trying to find (e.g., fugacity error).
-        P (float): Current value of pressure.
-        T (float): Current value of temperature.
+        Z_func (callable): EOS returning (Z_factors, A, B), e.g. srk_eos.
+        phi_func (callable): Fugacity coefficient from (Z, A, B).
+        P (float): Initial pressure.
+        T (float): Temperature.
         tolerance (float): Desired tolerance for the solution.
         max_iter (int): Maximum number of iterations.
+        derivative (str): "analytic" uses derivative_func; "numeric" uses the
+            central difference of fugacity_derivative.
+        derivative_func (callable): Analytic d(ln(phi_L) - ln(phi_V))/dP from
+            (P, Z_liquid, Z_vapor), e.g. srk_fugacity_residual_derivative.
+
+    Fugacity equality can only hold between the spinodal pressures of T,
+    where the liquid and vapor roots both exist. When the initial pressure
+    has a single root the spinodal bounds are computed (memoized in
+    envelope_cache): a temperature above the EOS critical point is rejected
+    before iterating, otherwise the pressure is moved inside the bounds. A
+    Newton step that lands outside is replaced by the midpoint between the
+    previous pressure and the bound it crossed.
 
     Returns:
-        float: The solution (root) of the function.
+        float: The solution (root) of the function. Convergence and failures are
+        logged at DEBUG level and counted by Utility.instrumentation.
     """
+    if derivative not in ("analytic", "numeric"):
+        raise ValueError("derivative must be 'analytic' or 'numeric'")
+
+    with instrumentation.timer("newton_raphson"):
+        P, iterations, converged = _newton_raphson(Z_func, phi_func, R, P, T, component, tolerance, max_iter,
+                                                   derivative, derivative_func)
+    if instrumentation.enabled:
+        instrumentation.count("iterations", iterations)
+        instrumentation.count("not_converged", not converged)
+    return P
+
+
+def _newton_raphson(Z_func, phi_func, R, P, T, component, tolerance, max_iter, derivative, derivative_func):
+    envelope = []
+
+    def spinodal_bounds(A, B, P):
+        # A/P and B/P do not depend on P, so any evaluation at T gives its bounds; only needed once a state leaves them
+        if not envelope:
+            envelope.extend(envelope_cache.get_or_compute(
+                parameter_key(Z_func, T, component),
+                lambda: tuple(float(bound) for bound in envelope_bounds(A / P, B / P))))
+        return envelope
+
+    Z_factors, A, B = Z_func(T, P, component)
+    if not select_roots(Z_factors, B)[2]:
+        # Single root: reject a supercritical temperature before iterating, otherwise move the seed into the envelope
+        P_low, P_high = spinodal_bounds(A, B, P)
+        P_inside, feasible = into_envelope(P, P_low, P_high)
+        if not feasible:
+            logger.debug("T=%g K: above the EOS critical temperature, no saturation pressure", T)
+            if instrumentation.enabled:
+                instrumentation.count("envelope_rejected")
+            return P, 0, False
+        P = float(P_inside)
+        Z_factors, A, B = Z_func(T, P, component)
 
-    for _ in range(max_iter):
-        f_value = fugacity_error(fv, fl)  # Evaluate the function
-        df_value = fugacity_derivative(Z_func, phi_func, R, P, T, component)  # Evaluate the derivative of the function
-
-        if f_value == 0:
-            print("Derivative is zero. Cannot proceed with Newton-Raphson.")
-            break
+    P_previous = P
+    for iteration in range(1, max_iter + 1):
+        if iteration > 1:
+            Z_factors, A, B = Z_func(T, P, component)
+        f_value, Z_sat, Z_vapor = _residual(phi_func, Z_factors, A, B)  # Evaluate the function
+        if Z_sat == Z_vapor and P != P_previous:
+            # The last step left the envelope: go back halfway to the bound it crossed instead
+            P_low, P_high = spinodal_bounds(A, B, P)
+            P = 0.5 * (P_previous + (P_high if P >= P_high else P_low))
+            continue
+        if derivative == "analytic":
+            df_value = derivative_func(P, Z_sat, Z_vapor)
+        else:
+            df_value = fugacity_derivative(Z_func, phi_func, R, P, T, component)
+
+        if df_value == 0:
+            logger.debug("T=%g K: derivative is zero at P=%g, cannot proceed with Newton-Raphson", T, P)
+            if instrumentation.enabled:
+                instrumentation.count("zero_derivative")
+            return P, iteration, False
 
         # Newton-Raphson update
         P_new = P - f_value / df_value
 
         # Check for convergence
         if abs(P_new - P) < tolerance:
-            print(f"Converged after {_ + 1} iterations.")
-            return P_new
+            logger.debug("T=%g K: converged after %d iterations", T, iteration)
+            return P_new, iteration, True
 
-        P = P_new
+        P_previous, P = P, P_new
 
-    print("Max iterations reached without convergence.")
-    return P  # Return the last computed value if max_iter is reached
+    logger.debug("T=%g K: max iterations reached without convergence", T)
+    return P, max_iter, False  # Return the last computed value if max_iter is reached
@@ -1,71 +1,127 @@
 import numpy as np
+from components.registry import peng_robinson_kappa
+from Utility.cubic_solver import z_roots
+from Utility.departure_functions import property_bundle
+from Utility.instrumentation import instrumentation
 
 R = 0.08314
 
-antoine_constants = {
-    "C1": {"A": 3.9895, "B": 443.028, "C": -0.49, "T_c": 190.6, "P_c": 46.1, "omega": 0.011},
-    "C3": {"A": 4.01158, "B": 834.26, "C": -22.763, "T_c": 369.9, "P_c": 42.5, "omega": 0.152},
-    "C5": {"A": 3.9892, "B": 1070.617, "C": -40.454, "T_c": 469.8, "P_c": 33.6, "omega": 0.249},
-    "C7": {"A": 4.81803, "B": 1635.409, "C": -27.338, "T_c": 540, "P_c": 27.4, "omega": 0.302},
-    "H2O": {"A": 4.6543, "B": 1435.264, "C": -64.848, "T_c": 647, "P_c": 220.64, "omega": 0.344},
-}
 
-
-def peng_robinson(T, P, component):
+def peng_robinson_parameters(T, component):
     """
-    Calculate compressibility factor (Z) using the Peng-Robinson EOS.
+    Calculate the Peng-Robinson attraction and co-volume parameters.
+
+    T and the component properties may be NumPy arrays of any broadcastable shape.
 
     Parameters:
-        R (float): Universal gas constant (J/mol.K)
-        P (float): Pressure (bar)
-        T (float): Temperature (K)
-        Tc (float): Critical temperature (K)
-        Pc (float): Critical pressure (bar)
-        omega (float): Acentric factor
+        T (float or ndarray): Temperature in Kelvin.
+        component (dict): Critical properties (T_c, P_c, omega), scalars or arrays.
 
     Returns:
-        dict: Compressibility factors (Z_vapor, Z_liquid), or None if no roots exist.
+        tuple: (a, b) broadcast over T and the component properties
     """
-
     Tc = component["T_c"]
-    Pc = component["P_c"] * 1e5  # Convert P_c from atm to Pa
-    omega = component["omega"]
-
-    # Convert P and Pc to Pa
-    P = P * 1e5
-    Pc = Pc * 1e5
+    Pc = component["P_c"] * 1e5  # Convert P_c from bar to Pa
 
-    # Reduced temperature and alpha term
-    Tr = T / Tc
-    alpha = (1 + (0.37464 + 1.54226 * omega - 0.26992 * omega ** 2) * (1 - np.sqrt(Tr))) ** 2
+    alpha, _ = peng_robinson_alpha(T, component)
 
-    # Calculate 'a' and 'b'
-    a = 0.45724 * (R * Tc) ** 2 / Pc * alpha
+    a = 0.45724 * (R * Tc) ** 2 * alpha / Pc
     b = 0.07780 * R * Tc / Pc
+    return a, b
+
+
+def peng_robinson_alpha(T, component):
+    """
+    Peng-Robinson alpha function and its logarithmic temperature derivative.
+
+    The slope m is the component's "kappa_pr" when given (a fitted value),
+    otherwise the omega correlation.
+
+    Parameters:
+        T (float or ndarray): Temperature in Kelvin.
+        component (dict): Critical properties (T_c, omega, optionally kappa_pr), scalars or arrays.
+
+    Returns:
+        tuple: (alpha, d ln(alpha)/d ln(T)) broadcast over T and the component properties.
+    """
+    m = component["kappa_pr"] if "kappa_pr" in component else peng_robinson_kappa(component["omega"])
+    sqrt_Tr = np.sqrt(np.asarray(T) / component["T_c"])
+    root = 1 + m * (1 - sqrt_Tr)
+    return root ** 2, -m * sqrt_Tr / root
+
+
+def peng_robinson_dimensionless_parameters(T, P, component):
+    """
+    Calculate the dimensionless Peng-Robinson parameters A and B.
+
+    Parameters:
+        T (float or ndarray): Temperature in Kelvin.
+        P (float or ndarray): Pressure in Pa.
+        component (dict): Critical properties (T_c, P_c, omega), scalars or arrays.
 
-    # A and B terms for the cubic equation
+    Returns:
+        tuple: (A, B) broadcast over T, P and the component properties.
+    """
+    T = np.asarray(T, dtype=float)
+    a, b = peng_robinson_parameters(T, component)
     A = a * P / (R ** 2 * T ** 2)
     B = b * P / (R * T)
+    return A, B
 
-    # Define the cubic equation coefficients
-    coeffs = [1, -(1 - B), A - (3 * B ** 2) - (2 * B), -(A * B - B ** 2 - B ** 3)]
 
-    # Solve the cubic equation
-    Z_roots = np.roots(coeffs)
+def peng_robinson(T, P, component):
+    """
+    Calculate compressibility factor (Z) using the Peng-Robinson EOS.
 
-    # Filter real roots
-    Z_roots_real = Z_roots[np.isreal(Z_roots)].real
+    Parameters:
+        T (float): Temperature (K)
+        P (float): Pressure (Pa)
+        component (dict): Critical properties (T_c, P_c, omega) for the component.
 
-    # Sort roots in ascending order
-    Z_roots_real.sort()
+    Returns:
+        dict: Compressibility factors (Z_vapor, Z_liquid); Z_liquid is None if only one root exists.
+    """
+    A, B = peng_robinson_dimensionless_parameters(T, P, component)
+
+    # Solve the cubic equation in closed form
+    Z_liquid, Z_vapor, three_real = z_roots(A, B)
 
     # Return vapor and liquid phase Z-factors
-    if len(Z_roots_real) == 1:  # Single root (e.g., supercritical state)
-        return {"Z_vapor": float(Z_roots_real[0]), "Z_liquid": None}
-    elif len(Z_roots_real) > 1:  # Two or three roots
-        return {"Z_vapor": float(Z_roots_real[-1]), "Z_liquid": float(Z_roots_real[0])}
-    else:  # No real roots (should not happen in practical conditions)
-        return {"Z_vapor": None, "Z_liquid": None}
+    if not three_real:  # Single root (e.g., supercritical state)
+        return {"Z_vapor": float(Z_vapor), "Z_liquid": None}
+    return {"Z_vapor": float(Z_vapor), "Z_liquid": float(Z_liquid)}
+
+
+def peng_robinson_z_factors(T, P, component):
+    """
+    Array version of peng_robinson returning the liquid and vapor roots separately.
+
+    Parameters:
+        T (float or ndarray): Temperature in Kelvin.
+        P (float or ndarray): Pressure in Pa.
+        component (dict): Critical properties (T_c, P_c, omega), scalars or arrays.
+
+    Returns:
+        tuple: (Z_liquid, Z_vapor, A, B). Where only one real root exists
+        Z_liquid and Z_vapor are equal.
+    """
+    A, B = peng_robinson_dimensionless_parameters(T, P, component)
+    Z_liquid, Z_vapor, _ = z_roots(A, B)
+    return Z_liquid, Z_vapor, A, B
+
+
+def peng_robinson_ln_fugacity_coefficient(Z, A, B):
+    """
+    Natural log of the Peng-Robinson fugacity coefficient, clipped to
+    [-700, 700] so that np.exp never overflows. Works element-wise on arrays.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        term1 = Z - 1
+        term2 = np.log(Z - B)
+        term3 = A / (2 * np.sqrt(2) * B) * np.log((Z + (1 + np.sqrt(2)) * B) / (Z + (1 - np.sqrt(2)) * B))
+    if instrumentation.enabled:
+        instrumentation.count("fugacity_evaluations", np.size(term3))
+    return np.clip(term1 - term2 - term3, -700, 700)
 
 
 def peng_robinson_fugacity_coefficient(T, P, Z, component):
@@ -73,39 +129,84 @@ def peng_robinson_fugacity_coefficient(T, P, Z, component):
     Calculate the fugacity coefficient for the vapor phase using Peng-Robinson EOS.
 
     Parameters:
-        T (float): Temperature in Kelvin.
-        P (float): Pressure in Pa.
-        Z (float): Compressibility factor.
+        T (float or ndarray): Temperature in Kelvin.
+        P (float or ndarray): Pressure in Pa.
+        Z (float or ndarray): Compressibility factor.
         component (dict): Dictionary containing critical properties (T_c, P_c, omega) for the component.
 
     Returns:
-        float: Fugacity coefficient (phi) for the vapor phase.
+        float or ndarray: Fugacity coefficient (phi) for the vapor phase.
     """
-    # Retrieve critical properties
-    Tc = component["T_c"]
-    Pc = component["P_c"] * 1e5  # Convert P_c from atm to Pa
-    omega = component["omega"]
+    A, B = peng_robinson_dimensionless_parameters(T, P, component)
 
-    # Calculate a and b parameters
-    Tr = T / Tc
-    alpha = (1 + (0.37464 + 1.54226 * omega - 0.26992 * omega ** 2) * (1 - np.sqrt(Tr))) ** 2
-    a = 0.45724 * (R * Tc) ** 2 * alpha / Pc
-    b = 0.07780 * R * Tc / Pc
+    # Fugacity coefficient (phi) calculation
+    return np.exp(peng_robinson_ln_fugacity_coefficient(Z, A, B))
 
-    # Calculate A and B
-    A = a * P / (R ** 2 * T ** 2)
-    B = b * P / (R * T)
 
-    # Fugacity coefficient (phi) calculation
-    print(Z)
-    term1 = Z - 1
+def peng_robinson_fugacity_residual(T, P, component):
+    """
+    Fugacity-equality residual ln(phi_L) - ln(phi_V) over arrays of states.
+
+    The residual is zero at the saturation pressure. At states with a single
+    real root both phases collapse onto it and the residual is zero as well,
+    so callers should check Z_liquid < Z_vapor.
 
-    term2 = np.log(Z - B)
-    term3 = A / (2 * np.sqrt(2) * B) * np.log((Z + (1 + np.sqrt(2)) * B) / (Z + (1 - np.sqrt(2)) * B))
+    Parameters:
+        T (float or ndarray): Temperature in Kelvin.
+        P (float or ndarray): Pressure in Pa.
+        component (dict): Critical properties (T_c, P_c, omega), scalars or arrays.
+
+    Returns:
+        tuple: (residual, Z_liquid, Z_vapor)
+    """
+    Z_liquid, Z_vapor, A, B = peng_robinson_z_factors(T, P, component)
+    residual = (peng_robinson_ln_fugacity_coefficient(Z_liquid, A, B)
+                - peng_robinson_ln_fugacity_coefficient(Z_vapor, A, B))
+    return residual, Z_liquid, Z_vapor
+
+
+def peng_robinson_fugacity_residual_derivative(P, Z_liquid, Z_vapor):
+    """
+    Analytic pressure derivative of the residual ln(phi_L) - ln(phi_V) at constant T.
+
+    Differentiating ln(phi) through the cubic, with dZ/dP taken implicitly
+    from the cubic itself, every A- and B-dependent term cancels and leaves
+    d ln(phi)/dP = (Z - 1)/P for each root. The residual derivative is
+    therefore (Z_L - Z_V)/P and needs no extra cubic solves.
+
+    Parameters:
+        P (float or ndarray): Pressure in Pa
+        Z_liquid (float or ndarray): Liquid compressibility factor at P
+        Z_vapor (float or ndarray): Vapor compressibility factor at P
+
+    Returns:
+        float or ndarray: d(ln(phi_L) - ln(phi_V))/dP in 1/Pa
+    """
+    return (Z_liquid - Z_vapor) / P
+
+
+def peng_robinson_properties(T, P, component):
+    """
+    Liquid and vapor volumes, densities, ln(phi) and residual enthalpy and
+    entropy at (T, P) from one cubic solve; see
+    Utility.departure_functions.property_bundle for the fields.
+
+    Volumes and departure functions use R in J/(mol K); the R of this module
+    cancels out of A and B.
+
+    Parameters:
+        T (float or ndarray): Temperature in Kelvin.
+        P (float or ndarray): Pressure in Pa.
+        component (dict): Critical properties (T_c, P_c, omega), scalars or arrays.
+
+    Returns:
+        dict: Property arrays broadcast over T, P and the component properties.
+    """
+    T = np.asarray(T, dtype=float)
+    A, B = peng_robinson_dimensionless_parameters(T, P, component)
+    _, dln_alpha_dln_T = peng_robinson_alpha(T, component)
+    return property_bundle(T, P, A, B, dln_alpha_dln_T)
 
-    ln_phi = term1 - term2 - term3
-    phi = np.exp(ln_phi)
-    return phi
 
 #
 # # Example Usage
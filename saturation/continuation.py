@@ -0,0 +1,146 @@
+import math
+
+import numpy as np
+from Utility.cubic_solver import BETA_CRITICAL, B_CRITICAL
+from saturation.jit_kernels import saturation_point_kernel, spinodal_bracket
+from saturation.residual import EOS_MODELS, antoine_pressure, fugacity_residual, reduced_coefficients
+
+
+def eos_critical_point(component, eos="srk", tolerance=1e-10):
+    """
+    Critical point predicted by the EOS itself.
+
+    It differs from the tabulated T_c and P_c whenever the EOS constants do
+    not reproduce them exactly, and no saturation pressure exists above it.
+    At fixed T the ratio B/A = b*R*T/a(T) does not depend on pressure and
+    increases with T; the critical temperature is where it reaches
+    BETA_CRITICAL, found by bisection, and there B = B_CRITICAL.
+
+    Returns:
+        tuple: (T_c, P_c) in K and Pa
+    """
+    def beta(T):
+        A1, B1 = reduced_coefficients(T, component, eos)
+        return float(B1 / A1)
+
+    low, high = 0.25 * component["T_c"], 4.0 * component["T_c"]
+    while high - low > tolerance * high:
+        mid = 0.5 * (low + high)
+        if beta(mid) < BETA_CRITICAL:
+            low = mid
+        else:
+            high = mid
+    T_c = 0.5 * (low + high)
+    _, B1 = reduced_coefficients(T_c, component, eos)
+    return T_c, float(B_CRITICAL / B1)
+
+
+def clausius_clapeyron_seed(history, T):
+    """
+    Extrapolate ln(P) linearly in 1/T through the last two converged (T, P) points.
+    """
+    (T1, P1), (T2, P2) = history[-2], history[-1]
+    slope = (math.log(P2) - math.log(P1)) / (1 / T2 - 1 / T1)
+    return math.exp(math.log(P2) + slope * (1 / T - 1 / T2))
+
+
+def continuation_curve(component, eos="srk", T_min=70.0, T_max=None, T_step=1.0, tolerance=1e-8, max_iter=100,
+                       min_step=1e-4):
+    """
+    Saturation curve solved by marching up in temperature, each point seeded
+    from the points already converged.
+
+    The first point is seeded from the Antoine equation; after that the seed
+    is the Clausius-Clapeyron extrapolation of the last two converged
+    points. The march never steps more than half the remaining distance to
+    the EOS critical temperature, so the step shrinks geometrically as
+    Tr -> 1 and the extrapolation stays accurate; extra intermediate
+    temperatures solved on the way only serve as seeds. A failed solve
+    halves the step and retries. Grid points at or above the EOS critical
+    temperature (see eos_critical_point) are returned unconverged without
+    iterating.
+
+    Each solve is one call of saturation_point_kernel (bracketed Newton
+    inside the spinodals), compiled when numba is installed; the reduced
+    coefficients and spinodal brackets of the grid are computed up front.
+
+    Parameters:
+        component (dict): Component properties (A, B, C, T_c, P_c, omega)
+        eos (str): "srk" or "pr"
+        T_min (float): First temperature in Kelvin
+        T_max (float): Exclusive upper temperature, defaults to T_c
+        T_step (float): Temperature step of the returned grid in Kelvin
+        tolerance (float): Convergence tolerance on the relative pressure step
+        max_iter (int): Maximum iterations per solve
+        min_step (float): Smallest temperature step before a point is given up
+
+    Returns:
+        dict: The saturation_curve fields ("T", "P_sat", "Z_liquid", "Z_vapor",
+        "phi", "iterations", "converged"), where iterations counts every solve
+        made to reach the point and unconverged points are NaN, plus
+        "T_critical" and "P_critical" of the EOS
+    """
+    if T_max is None:
+        T_max = component["T_c"]
+    T_critical, P_critical = eos_critical_point(component, eos)
+
+    T = T_min + T_step * np.arange(max(int(np.ceil((T_max - T_min) / T_step)), 0))
+    P_sat = np.full(T.shape, np.nan)
+    iterations = np.zeros(T.shape, dtype=int)
+    converged = np.zeros(T.shape, dtype=bool)
+
+    A1, B1 = reduced_coefficients(T, component, eos)
+    ln_low, ln_high = spinodal_bracket(A1, B1)
+    grid = {float(T_point): i for i, T_point in enumerate(T)}
+
+    def solve_at(T_point, P0):
+        i = grid.get(T_point)
+        if i is None:
+            a1, b1 = reduced_coefficients(np.array([T_point]), component, eos)
+            low, high = spinodal_bracket(a1, b1)
+            return saturation_point_kernel(float(a1[0]), float(b1[0]), P0, float(low[0]), float(high[0]),
+                                           tolerance, max_iter)
+        return saturation_point_kernel(float(A1[i]), float(B1[i]), P0, float(ln_low[i]), float(ln_high[i]),
+                                       tolerance, max_iter)
+
+    history = []
+    for i, T_target in enumerate(T.tolist()):
+        if T_target >= T_critical:
+            continue
+        while True:
+            if len(history) < 2:
+                # Antoine for the first point, then the last solution scaled by the Antoine ratio
+                target = T_target
+                P0 = float(antoine_pressure(target, component))
+                if history:
+                    P0 *= history[-1][1] / float(antoine_pressure(history[-1][0], component))
+            else:
+                T_last = history[-1][0]
+                target = min(T_target, T_last + max(0.5 * (T_critical - T_last), min_step))
+                P0 = clausius_clapeyron_seed(history, target)
+            P, n, ok = solve_at(target, P0)
+            iterations[i] += n
+            if ok and target == T_target:
+                history.append((target, P))
+                P_sat[i] = P
+                converged[i] = True
+                break
+            if ok:
+                history.append((target, P))
+                continue
+            # Failed: retry from halfway, or give up once the step is below min_step
+            if len(history) < 2 or target - history[-1][0] < min_step:
+                break
+            T_half = 0.5 * (history[-1][0] + target)
+            P_half, n, ok = solve_at(T_half, clausius_clapeyron_seed(history, T_half))
+            iterations[i] += n
+            if not ok:
+                break
+            history.append((T_half, P_half))
+
+    # Evaluate both phases at the solution, as saturation_curve does; unconverged points are NaN
+    _, Z_liquid, Z_vapor, _ = fugacity_residual(A1, B1, P_sat, eos)
+    _, ln_fugacity_coefficient = EOS_MODELS[eos]
+    phi = np.exp(ln_fugacity_coefficient(Z_vapor, A1 * P_sat, B1 * P_sat))
+    return {"T": T, "P_sat": P_sat, "Z_liquid": Z_liquid, "Z_vapor": Z_vapor, "phi": phi,
+            "iterations": iterations, "converged": converged, "T_critical": T_critical, "P_critical": P_critical}
@@ -0,0 +1,147 @@
+import functools
+import hashlib
+import importlib
+import json
+import os
+import struct
+import tempfile
+
+import numpy as np
+from saturation.psat_solver import saturation_curve
+
+# Bump when the file layout changes so old files are invalidated
+CACHE_VERSION = 2
+
+# Modules whose source determines the numbers in a cached curve; editing any of them invalidates the cache
+NUMERICS_MODULES = (
+    "Antoine_equation.antoine",
+    "Utility.cubic_solver",
+    "Utility.phase_identification",
+    "srk_eos.srk_eos",
+    "peng_robinson.peng_robinson",
+    "saturation.residual",
+    "saturation.engines",
+    "saturation.jit_kernels",
+    "saturation.psat_solver",
+)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "vapor-pressure-srk-pr")
+
+# Stored in this order, each as a contiguous float64 array of n_points values
+FIELDS = ("T", "P_sat", "Z_liquid", "Z_vapor", "phi", "iterations", "converged")
+
+# magic, version, number of fields, number of points, sha256 of the cache key; padded to 64 bytes
+MAGIC = b"VPSATCRV"
+HEADER = struct.Struct("<8sIIQ32s")
+HEADER_SIZE = 64
+
+
+@functools.lru_cache(maxsize=None)
+def numerics_fingerprint():
+    """SHA-256 hex digest of the source files of NUMERICS_MODULES, computed once per process."""
+    digest = hashlib.sha256()
+    for module_name in NUMERICS_MODULES:
+        with open(importlib.import_module(module_name).__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def cache_key(T, component, eos, solver_options):
+    """
+    SHA-256 digest over everything that determines a saturation curve: the
+    temperature grid, the component constants, the EOS, the solver settings,
+    CACHE_VERSION and the numerics_fingerprint of the solver code.
+    """
+    T = np.ascontiguousarray(T, dtype=float)
+    description = json.dumps({
+        "version": CACHE_VERSION,
+        "numerics": numerics_fingerprint(),
+        "eos": eos,
+        "component": {key: float(value) for key, value in sorted(component.items())},
+        "solver": {key: repr(value) for key, value in sorted(solver_options.items())},
+        "T_shape": T.shape,
+        "T": hashlib.sha256(T.tobytes()).hexdigest(),
+    }, sort_keys=True)
+    return hashlib.sha256(description.encode()).digest()
+
+
+def write_curve(path, curve, key):
+    """
+    Write a curve dict to path: header followed by one float64 array per field.
+    The file is written to a temporary name and moved into place.
+    """
+    n_points = np.asarray(curve["T"]).size
+    data = np.empty((len(FIELDS), n_points))
+    for row, field in enumerate(FIELDS):
+        data[row] = np.asarray(curve[field], dtype=float).ravel()
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    handle, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as f:
+            f.write(HEADER.pack(MAGIC, CACHE_VERSION, len(FIELDS), n_points, key).ljust(HEADER_SIZE, b"\0"))
+            f.write(data.tobytes())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def read_curve(path, key=None):
+    """
+    Open a cached curve with np.memmap (zero-copy, read-only).
+
+    Returns:
+        dict or None: Field name -> memory-mapped float64 array, or None when the
+        file is missing, malformed, from another CACHE_VERSION, or was built for a
+        different key.
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        size = os.path.getsize(path)
+    except OSError:
+        return None
+    if len(header) < HEADER.size:
+        return None
+    magic, version, n_fields, n_points, stored_key = HEADER.unpack_from(header)
+    if magic != MAGIC or version != CACHE_VERSION or n_fields != len(FIELDS):
+        return None
+    if key is not None and stored_key != key:
+        return None
+    if size != HEADER_SIZE + n_fields * n_points * 8:
+        return None
+
+    data = np.memmap(path, dtype=np.float64, mode="r", offset=HEADER_SIZE, shape=(n_fields, n_points))
+    return {field: data[row] for row, field in enumerate(FIELDS)}
+
+
+def cached_saturation_curve(T, component, eos="srk", name=None, cache_dir=DEFAULT_CACHE_DIR, **solver_options):
+    """
+    saturation_curve backed by a persistent on-disk cache.
+
+    The file for (name, eos) stores the key it was built for; a change to the
+    temperature grid, component constants, EOS, solver settings or solver
+    code therefore invalidates it and the curve is recomputed and rewritten. Without a name
+    the file is named after the key itself. If the cache directory cannot be
+    written the freshly solved curve is returned as plain arrays.
+
+    Returns:
+        dict: Field name -> 1-D float64 array (memory-mapped on a cache hit)
+    """
+    key = cache_key(T, component, eos, solver_options)
+    stem = f"{name}_{eos}" if name is not None else key.hex()[:32]
+    path = os.path.join(cache_dir, stem + ".vpsc")
+
+    curve = read_curve(path, key)
+    if curve is not None:
+        return curve
+
+    curve = saturation_curve(np.ravel(T), component, eos, **solver_options)
+    try:
+        write_curve(path, curve, key)
+    except OSError:
+        # Read-only or full cache directory: serve the fresh result uncached
+        return {field: np.asarray(curve[field], dtype=float).ravel() for field in FIELDS}
+    return read_curve(path, key)
@@ -0,0 +1,238 @@
+import numpy as np
+from Utility.phase_identification import envelope_bounds
+from saturation.residual import fugacity_residual, fugacity_residual_slope, single_root_direction
+
+# Multiplicative pressure step used to walk a single-root state back towards the two-phase region
+SINGLE_ROOT_STEP = 1.5
+
+# Largest change of ln(P) allowed in one Newton step
+MAX_LN_STEP = 5.0
+
+# Smallest ln(P) the bracketed engine searches when the liquid spinodal pressure is negative
+LN_P_FLOOR = np.log(np.finfo(float).tiny)
+
+
+def spinodal_ln_bracket(A1, B1, spinodals=None):
+    """
+    ln(P) bounds of the three-root region for each temperature.
+
+    Parameters:
+        A1, B1 (ndarray): Reduced coefficients A/P and B/P
+        spinodals (tuple): (P_low, P_high) already computed for these points
+            (see Utility.phase_identification.envelope_bounds); computed here when None
+
+    Returns:
+        tuple: (ln_low, ln_high); ln_low is LN_P_FLOOR where the liquid spinodal
+        pressure is not positive, ln_high is NaN where the temperature is supercritical
+    """
+    P_low, P_high = envelope_bounds(A1, B1) if spinodals is None else spinodals
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ln_high = np.log(P_high)
+        ln_low = np.where(P_low > 0, np.log(np.where(P_low > 0, P_low, 1.0)), LN_P_FLOOR)
+    return ln_low, ln_high
+
+
+def newton_engine(A1, B1, P0, eos="srk", tolerance=1e-8, max_iter=100, derivative="analytic", delta=1e-4,
+                  spinodals=None):
+    """
+    Newton's method on ln(P), all points in lock-step.
+
+    The Newton slope d(ln(phi_L) - ln(phi_V))/d(ln P) = Z_L - Z_V is analytic,
+    so each iteration costs one cubic solve; derivative="numeric" switches to
+    a central difference that costs three.
+
+    Parameters:
+        A1, B1 (ndarray): Reduced coefficients A/P and B/P (1-D)
+        P0 (ndarray): Initial pressures in Pa
+        eos (str): "srk" or "pr"
+        tolerance (float): Convergence tolerance on the relative pressure step
+        max_iter (int): Maximum number of iterations
+        derivative (str): "analytic" or "numeric"
+        delta (float): Relative perturbation of the numeric derivative
+        spinodals (tuple): Accepted for a common engine signature; not used
+
+    Returns:
+        tuple: (P_sat, iterations, converged) 1-D arrays
+    """
+    if derivative not in ("analytic", "numeric"):
+        raise ValueError("derivative must be 'analytic' or 'numeric'")
+
+    ln_P = np.log(P0)
+    iterations = np.zeros(ln_P.shape, dtype=int)
+    converged = np.zeros(ln_P.shape, dtype=bool)
+
+    for _ in range(max_iter):
+        active = np.flatnonzero(~converged)
+        if active.size == 0:
+            break
+        a1 = A1[active]
+        b1 = B1[active]
+        P = np.exp(ln_P[active])
+
+        residual, Z_liquid, Z_vapor, three_real = fugacity_residual(a1, b1, P, eos)
+
+        if derivative == "analytic":
+            slope = fugacity_residual_slope(P, Z_liquid, Z_vapor, eos)
+        else:
+            # Central difference of the residual with respect to ln(P)
+            residual_plus = fugacity_residual(a1, b1, P * np.exp(delta), eos)[0]
+            residual_minus = fugacity_residual(a1, b1, P * np.exp(-delta), eos)[0]
+            slope = (residual_plus - residual_minus) / (2 * delta)
+
+        # Where the slope vanishes (clipped ln(phi) for the numeric derivative)
+        # fall back to the successive-substitution step ln(P) += ln(phi_L/phi_V)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            step = np.where(slope < 0, -residual / slope, residual)
+        step = np.clip(step, -MAX_LN_STEP, MAX_LN_STEP)
+
+        # Single-root states cannot satisfy the fugacity equality; move towards the two-phase region
+        step = np.where(three_real, step,
+                        np.log(SINGLE_ROOT_STEP) * single_root_direction(b1 * P, Z_vapor))
+
+        ln_P[active] += step
+        iterations[active] += 1
+        converged[active] = three_real & (np.abs(step) < tolerance)
+
+    return np.exp(ln_P), iterations, converged
+
+
+def bracketed_engine(A1, B1, P0, eos="srk", tolerance=1e-8, max_iter=100, spinodals=None):
+    """
+    Safeguarded Newton/bisection hybrid on ln(P), bracketed by the spinodal pressures.
+
+    Only pressures between the liquid and vapor spinodals give three roots, so
+    the saturation pressure always lies in that interval. The bracket shrinks
+    with the sign of the residual (positive below saturation) and any Newton
+    step that leaves it is replaced by bisection. Points above the EOS
+    critical temperature have no bracket and are returned unconverged.
+
+    Parameters:
+        A1, B1 (ndarray): Reduced coefficients A/P and B/P (1-D)
+        P0 (ndarray): Initial pressures in Pa
+        eos (str): "srk" or "pr"
+        tolerance (float): Convergence tolerance on the relative pressure step
+        max_iter (int): Maximum number of iterations
+        spinodals (tuple): (P_low, P_high) of these points, computed when None
+
+    Returns:
+        tuple: (P_sat, iterations, converged) 1-D arrays
+    """
+    ln_low, ln_high = spinodal_ln_bracket(A1, B1, spinodals)
+    has_bracket = np.isfinite(ln_high)
+
+    ln_P = np.log(P0)
+    inside = has_bracket & (ln_P > ln_low) & (ln_P < ln_high)
+    ln_P = np.where(inside, ln_P, 0.5 * (ln_low + ln_high))
+
+    iterations = np.zeros(ln_P.shape, dtype=int)
+    converged = np.zeros(ln_P.shape, dtype=bool)
+    done = ~has_bracket
+
+    for _ in range(max_iter):
+        active = np.flatnonzero(~done)
+        if active.size == 0:
+            break
+        x = ln_P[active]
+        low = ln_low[active]
+        high = ln_high[active]
+        b1 = B1[active]
+        P = np.exp(x)
+
+        residual, Z_liquid, Z_vapor, three_real = fugacity_residual(A1[active], b1, P, eos)
+
+        # Round-off at the bracket ends can lose a root; classify the state instead
+        below = np.where(three_real, residual > 0, single_root_direction(b1 * P, Z_vapor) > 0)
+        low = np.where(below, x, low)
+        high = np.where(below, high, x)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            x_new = x - residual / fugacity_residual_slope(P, Z_liquid, Z_vapor, eos)
+        # Converged on the raw Newton step: near the root it can land on a bracket end that x itself just moved
+        small_step = three_real & (np.abs(x_new - x) < tolerance)
+        bisect = ~small_step & (~three_real | ~np.isfinite(x_new) | (x_new <= low) | (x_new >= high))
+        x_new = np.where(bisect, 0.5 * (low + high), x_new)
+
+        ln_P[active] = x_new
+        ln_low[active] = low
+        ln_high[active] = high
+        iterations[active] += 1
+        finished = small_step | (high - low < tolerance)
+        converged[active] = finished
+        done[active] = finished
+
+    return np.exp(ln_P), iterations, converged
+
+
+def successive_substitution_engine(A1, B1, P0, eos="srk", tolerance=1e-8, max_iter=100, spinodals=None):
+    """
+    Classic fixed-point iteration P <- P * phi_L / phi_V, all points in lock-step.
+
+    Its contraction factor is 1 + Z_L - Z_V, which is close to Z_L at low
+    reduced temperature (very fast) and tends to 1 near the critical point.
+
+    Parameters:
+        A1, B1 (ndarray): Reduced coefficients A/P and B/P (1-D)
+        P0 (ndarray): Initial pressures in Pa
+        eos (str): "srk" or "pr"
+        tolerance (float): Convergence tolerance on the relative pressure step
+        max_iter (int): Maximum number of iterations
+        spinodals (tuple): Accepted for a common engine signature; not used
+
+    Returns:
+        tuple: (P_sat, iterations, converged) 1-D arrays
+    """
+    ln_P = np.log(P0)
+    iterations = np.zeros(ln_P.shape, dtype=int)
+    converged = np.zeros(ln_P.shape, dtype=bool)
+
+    for _ in range(max_iter):
+        active = np.flatnonzero(~converged)
+        if active.size == 0:
+            break
+        b1 = B1[active]
+        P = np.exp(ln_P[active])
+
+        residual, _, Z_vapor, three_real = fugacity_residual(A1[active], b1, P, eos)
+
+        step = np.where(three_real, np.clip(residual, -MAX_LN_STEP, MAX_LN_STEP),
+                        np.log(SINGLE_ROOT_STEP) * single_root_direction(b1 * P, Z_vapor))
+
+        ln_P[active] += step
+        iterations[active] += 1
+        converged[active] = three_real & (np.abs(step) < tolerance)
+
+    return np.exp(ln_P), iterations, converged
+
+
+SOLVER_ENGINES = {
+    "newton": newton_engine,
+    "bracketed": bracketed_engine,
+    "successive_substitution": successive_substitution_engine,
+}
+
+# (upper reduced temperature, engine) bands used by select_engine, in ascending order.
+# Newton takes the fewest iterations in the middle band. Far below T_c the Antoine
+# seed can be tens of decades off, and near T_c the two-phase pressure window is
+# narrow, so both ends use the bracketed engine. Successive substitution is
+# never faster than Newton here since the Newton slope comes for free.
+ENGINE_BANDS = (
+    (0.3, "bracketed"),
+    (0.8, "newton"),
+    (np.inf, "bracketed"),
+)
+
+
+def select_engine(Tr):
+    """
+    Name of the engine to use at each reduced temperature, from ENGINE_BANDS.
+
+    Parameters:
+        Tr (ndarray): Reduced temperatures T/T_c
+
+    Returns:
+        ndarray: Engine names, same shape as Tr
+    """
+    Tr = np.asarray(Tr, dtype=float)
+    upper = np.array([band[0] for band in ENGINE_BANDS])
+    names = np.array([band[1] for band in ENGINE_BANDS])
+    return names[np.minimum(np.searchsorted(upper, Tr, side="right"), len(names) - 1)]
@@ -0,0 +1,173 @@
+import math
+
+import numpy as np
+from saturation.engines import bracketed_engine, spinodal_ln_bracket
+
+try:
+    import numba
+except ImportError:  # numba is optional; without it jit_engine uses the NumPy code
+    numba = None
+
+HAVE_NUMBA = numba is not None
+
+
+def _jit():
+    # nopython compilation when numba is installed, otherwise leave the function as plain Python
+    if numba is None:
+        return lambda function: function
+    return numba.njit(cache=True, fastmath=False)
+
+SQRT2 = math.sqrt(2.0)
+
+
+@_jit()
+def cubic_roots_kernel(A, B):
+    """
+    Scalar counterpart of Utility.cubic_solver.z_roots for one (A, B) state:
+    largest root by Cardano/trigonometric formula with two Newton polishes,
+    the other two from the deflated quadratic.
+
+    Returns:
+        tuple: (Z_liquid, Z_vapor, three_real)
+    """
+    c2 = -(1.0 - B)
+    c1 = A - 2.0 * B - 3.0 * B * B
+    c0 = -(A * B - B * B - B * B * B)
+
+    shift = c2 / 3.0
+    p = c1 - c2 * shift
+    q = 2.0 * shift ** 3 - shift * c1 + c0
+    discriminant = (q / 2.0) ** 2 + (p / 3.0) ** 3
+    if discriminant > 0.0:
+        sqrt_d = math.sqrt(discriminant)
+        u = -q / 2.0 + sqrt_d
+        v = -q / 2.0 - sqrt_d
+        z_high = math.copysign(abs(u) ** (1.0 / 3.0), u) + math.copysign(abs(v) ** (1.0 / 3.0), v) - shift
+    else:
+        m = 2.0 * math.sqrt(-p / 3.0)
+        if m > 0.0:
+            z_high = m * math.cos(math.acos(min(max(3.0 * q / (p * m), -1.0), 1.0)) / 3.0) - shift
+        else:
+            z_high = -shift
+
+    for _ in range(2):
+        f = ((z_high + c2) * z_high + c1) * z_high + c0
+        df = (3.0 * z_high + 2.0 * c2) * z_high + c1
+        if df != 0.0:
+            z_high -= f / df
+
+    if z_high == 0.0:
+        return z_high, z_high, False
+    e0 = -c0 / z_high
+    e1 = (e0 - c1) / z_high
+    quadratic_discriminant = e1 * e1 - 4.0 * e0
+    if quadratic_discriminant < 0.0:
+        return z_high, z_high, False
+    root_q = -0.5 * (e1 + math.copysign(math.sqrt(quadratic_discriminant), e1))
+    if root_q == 0.0:
+        return z_high, z_high, False
+    z_low = min(root_q, e0 / root_q, z_high)
+    # Drop the smallest root when it lies below the co-volume (V < b is unphysical)
+    if z_low <= B:
+        return z_high, z_high, False
+    return z_low, z_high, True
+
+
+@_jit()
+def ln_fugacity_coefficient_kernel(Z, A, B):
+    """Scalar ln(phi) of the shared SRK/PR form for a physical root (Z > B), clipped to [-700, 700]."""
+    ln_phi = Z - 1.0 - math.log(Z - B) - A / (2.0 * SQRT2 * B) * math.log(
+        (Z + (1.0 + SQRT2) * B) / (Z + (1.0 - SQRT2) * B))
+    return min(max(ln_phi, -700.0), 700.0)
+
+
+@_jit()
+def saturation_point_kernel(A1, B1, P0, ln_low, ln_high, tolerance, max_iter):
+    """
+    Scalar counterpart of saturation.engines.bracketed_engine for one temperature:
+    Newton on ln(P) with slope Z_L - Z_V inside the spinodal bracket
+    (ln_low, ln_high), falling back to bisection when a step leaves it.
+
+    Returns:
+        tuple: (P_sat, iterations, converged)
+    """
+    if not (ln_high > ln_low):
+        # Supercritical: no spinodals, no saturation pressure
+        return P0, 0, False
+    x = math.log(P0)
+    if not (ln_low < x < ln_high):
+        x = 0.5 * (ln_low + ln_high)
+
+    for iteration in range(1, max_iter + 1):
+        P = math.exp(x)
+        A = A1 * P
+        B = B1 * P
+        Z_liquid, Z_vapor, three_real = cubic_roots_kernel(A, B)
+
+        if three_real:
+            residual = ln_fugacity_coefficient_kernel(Z_liquid, A, B) - ln_fugacity_coefficient_kernel(Z_vapor, A, B)
+            below = residual > 0.0
+        else:
+            # Round-off at the bracket ends can lose a root; classify the state instead
+            residual = 0.0
+            below = Z_vapor > (1.0 - B) / 3.0
+        if below:
+            ln_low = x
+        else:
+            ln_high = x
+
+        x_new = x - residual / (Z_liquid - Z_vapor) if three_real else math.nan
+        # Converged on the raw Newton step: near the root it can land on a bracket end that x itself just moved
+        if abs(x_new - x) < tolerance:
+            return math.exp(x_new), iteration, True
+        if not (ln_low < x_new < ln_high):
+            x_new = 0.5 * (ln_low + ln_high)
+
+        if ln_high - ln_low < tolerance:
+            return math.exp(x_new), iteration, True
+        x = x_new
+    return math.exp(x), max_iter, False
+
+
+@_jit()
+def _saturation_loop(A1, B1, P0, ln_low, ln_high, tolerance, max_iter, P_sat, iterations, converged):
+    for i in range(A1.size):
+        P_sat[i], iterations[i], converged[i] = saturation_point_kernel(A1[i], B1[i], P0[i], ln_low[i], ln_high[i],
+                                                                        tolerance, max_iter)
+
+
+def spinodal_bracket(A1, B1, spinodals=None):
+    """
+    ln(P) bounds of the three-root region for each temperature, see
+    saturation.engines.spinodal_ln_bracket; both NaN where the temperature
+    is supercritical.
+    """
+    ln_low, ln_high = spinodal_ln_bracket(A1, B1, spinodals)
+    return np.where(np.isfinite(ln_high), ln_low, np.nan), ln_high
+
+
+def jit_engine(A1, B1, P0, eos="srk", tolerance=1e-8, max_iter=100, spinodals=None):
+    """
+    Saturation engine backed by the compiled kernels, one kernel call
+    per temperature point. The spinodal bracket comes from spinodals, the
+    (P_low, P_high) bounds solve_saturation_pressure already computed, or is
+    computed once with NumPy; every iteration after that runs inside
+    saturation_point_kernel. Both EOS share the cubic and the ln(phi) form,
+    so eos is not used.
+
+    Without numba this is bracketed_engine.
+
+    Returns:
+        tuple: (P_sat, iterations, converged) 1-D arrays
+    """
+    if not HAVE_NUMBA:
+        return bracketed_engine(A1, B1, P0, eos, tolerance, max_iter, spinodals)
+    A1 = np.ascontiguousarray(A1, dtype=float)
+    B1 = np.ascontiguousarray(B1, dtype=float)
+    P0 = np.ascontiguousarray(P0, dtype=float)
+    ln_low, ln_high = spinodal_bracket(A1, B1, spinodals)
+    P_sat = np.empty(A1.size)
+    iterations = np.zeros(A1.size, dtype=np.int64)
+    converged = np.zeros(A1.size, dtype=np.bool_)
+    _saturation_loop(A1, B1, P0, ln_low, ln_high, tolerance, max_iter, P_sat, iterations, converged)
+    return P_sat, iterations, converged
@@ -0,0 +1,86 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from components.registry import antoine_constants
+from Utility.component_arrays import stack_components
+from saturation.psat_solver import saturation_curve
+
+# Component property arrays, installed once per worker process by _init_worker
+_worker_components = None
+
+
+def _init_worker(components):
+    global _worker_components
+    _worker_components = components
+
+
+def _solve_chunk(task):
+    index, eos, T, solver_options = task
+    component = {key: values[index] for key, values in _worker_components.items()}
+    return saturation_curve(T, component, eos, **solver_options)
+
+
+def sweep_tasks(components, eos_list, T_min, T_max, T_step, chunk_size, solver_options):
+    """
+    Split every (component, EOS) sweep into temperature chunks.
+
+    Returns:
+        list: (component index, eos, T chunk, solver_options) tuples in
+        component-major, EOS, ascending-temperature order
+    """
+    tasks = []
+    for index in range(len(components["T_c"])):
+        upper = components["T_c"][index] if T_max is None else T_max
+        T = T_min + T_step * np.arange(int(np.ceil((upper - T_min) / T_step)))
+        for eos in eos_list:
+            for start in range(0, T.size, chunk_size):
+                tasks.append((index, eos, T[start:start + chunk_size], solver_options))
+    return tasks
+
+
+def parallel_sweep(components=None, eos_list=("srk", "pr"), T_min=70.0, T_max=None, T_step=1.0,
+                   max_workers=None, chunk_size=256, **solver_options):
+    """
+    Solve saturation curves for many components and EOS on a process pool.
+
+    Each (component, EOS, temperature chunk) is an independent task. The
+    stacked component property arrays are shipped to every worker once
+    through the pool initializer; tasks carry only an index, the EOS name
+    and their temperatures. Results are collected in submission order, so
+    the output does not depend on scheduling.
+
+    Parameters:
+        components (dict): Component name -> properties, defaults to antoine_constants
+        eos_list (tuple): EOS names to solve
+        T_min (float): First temperature in Kelvin
+        T_max (float): Exclusive upper temperature, defaults to each component's T_c
+        T_step (float): Temperature step in Kelvin
+        max_workers (int): Worker processes, defaults to os.cpu_count(); 1 runs in-process
+        chunk_size (int): Temperatures per task
+        **solver_options: Passed to solve_saturation_pressure
+
+    Returns:
+        dict: (component name, eos) -> saturation_curve dict
+    """
+    if components is None:
+        components = antoine_constants
+    names = list(components)
+    stacked = stack_components(components, names)
+    tasks = sweep_tasks(stacked, eos_list, T_min, T_max, T_step, chunk_size, solver_options)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers == 1:
+        _init_worker(stacked)
+        results = [_solve_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(stacked,)) as executor:
+            results = list(executor.map(_solve_chunk, tasks))
+
+    curves = {}
+    for (index, eos, _, _), chunk in zip(tasks, results):
+        curves.setdefault((names[index], eos), []).append(chunk)
+    return {key: {field: np.concatenate([chunk[field] for chunk in chunks]) for field in chunks[0]}
+            for key, chunks in curves.items()}
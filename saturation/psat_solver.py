@@ -0,0 +1,151 @@
+import logging
+
+import numpy as np
+from Utility.instrumentation import instrumentation
+from Utility.phase_identification import into_envelope
+from saturation.residual import (EOS_MODELS, EOS_PROPERTIES, antoine_pressure, fugacity_residual,
+                                 reduced_coefficients, spinodal_pressures)
+from saturation.engines import SOLVER_ENGINES, select_engine
+from saturation.jit_kernels import jit_engine
+
+logger = logging.getLogger(__name__)
+
+# Registered here rather than in engines.py because the kernels import the engine constants
+SOLVER_ENGINES["jit"] = jit_engine
+
+
+def solve_saturation_pressure(T, component, eos="srk", P0=None, tolerance=1e-8, max_iter=100,
+                              engine="auto", **options):
+    """
+    Solve the fugacity equality ln(phi_L) = ln(phi_V) for all temperatures at once.
+
+    Every temperature is iterated in lock-step; converged points are masked
+    out and no longer evaluated. With engine="auto" each point is handed to
+    the engine that select_engine picks for its reduced temperature.
+
+    Before any iteration the initial pressures are checked against the
+    spinodal bounds of their temperature (saturation.residual.spinodal_pressures):
+    temperatures above the EOS critical point are returned unconverged with
+    NaN pressure and no iterations, and seeds outside the envelope, where
+    fugacity equality cannot hold, are moved just inside it. The same bounds
+    are handed to the engines as their spinodals argument.
+
+    Parameters:
+        T (float or ndarray): Temperatures in Kelvin
+        component (dict): Component properties (A, B, C, T_c, P_c, omega), scalars or arrays
+        eos (str): "srk" or "pr"
+        P0 (float or ndarray): Initial pressures in Pa, defaults to the Antoine estimate
+        tolerance (float): Convergence tolerance on the relative pressure step
+        max_iter (int): Maximum number of iterations
+        engine (str): "auto" or a key of SOLVER_ENGINES
+        **options: Extra keyword arguments for the "newton" engine (derivative, delta)
+
+    Returns:
+        tuple: (P_sat, iterations, converged) arrays broadcast over T and the
+        component properties; P_sat is in Pa and NaN above the EOS critical point.
+    """
+    if engine != "auto" and engine not in SOLVER_ENGINES:
+        raise ValueError(f"unknown engine {engine!r}, choose 'auto' or one of {sorted(SOLVER_ENGINES)}")
+    if not instrumentation.enabled:
+        return _solve_saturation_pressure(T, component, eos, P0, tolerance, max_iter, engine, options)
+
+    with instrumentation.timer("saturation_solve"):
+        P_sat, iterations, converged = _solve_saturation_pressure(T, component, eos, P0, tolerance, max_iter,
+                                                                  engine, options)
+    failures = converged.size - np.count_nonzero(converged)
+    instrumentation.count("saturation_points", converged.size)
+    instrumentation.count("iterations", iterations.sum())
+    instrumentation.count("not_converged", failures)
+    if failures:
+        logger.debug("%s: %d of %d saturation points did not converge", eos, failures, converged.size)
+    return P_sat, iterations, converged
+
+
+def _solve_saturation_pressure(T, component, eos, P0, tolerance, max_iter, engine, options):
+    A1, B1 = reduced_coefficients(T, component, eos)
+    shape = A1.shape
+    if P0 is None:
+        P0 = antoine_pressure(T, component)
+    P_low, P_high = (np.broadcast_to(bound, shape).ravel() for bound in spinodal_pressures(T, component, eos))
+    P0, feasible = into_envelope(np.broadcast_to(np.asarray(P0, dtype=float), shape).ravel(), P_low, P_high)
+
+    P_sat = np.full(P0.shape, np.nan)
+    iterations = np.zeros(P0.shape, dtype=int)
+    converged = np.zeros(P0.shape, dtype=bool)
+
+    # Supercritical points have no envelope and are never iterated
+    index = np.flatnonzero(feasible)
+    if instrumentation.enabled:
+        instrumentation.count("envelope_rejected", P0.size - index.size)
+    A1 = A1.ravel()[index]
+    B1 = B1.ravel()[index]
+    P0 = P0[index]
+    # The engines bracket with the same bounds instead of recomputing them
+    P_low = P_low[index]
+    P_high = P_high[index]
+
+    if engine != "auto":
+        P_sat[index], iterations[index], converged[index] = SOLVER_ENGINES[engine](
+            A1, B1, P0, eos, tolerance, max_iter, spinodals=(P_low, P_high), **options)
+        return P_sat.reshape(shape), iterations.reshape(shape), converged.reshape(shape)
+
+    Tr = np.broadcast_to(np.asarray(T, dtype=float) / component["T_c"], shape).ravel()[index]
+    engines = select_engine(Tr)
+
+    for name in np.unique(engines):
+        subset = np.flatnonzero(engines == name)
+        engine_options = options if name == "newton" else {}
+        P_sat[index[subset]], iterations[index[subset]], converged[index[subset]] = SOLVER_ENGINES[name](
+            A1[subset], B1[subset], P0[subset], eos, tolerance, max_iter,
+            spinodals=(P_low[subset], P_high[subset]), **engine_options)
+
+    return P_sat.reshape(shape), iterations.reshape(shape), converged.reshape(shape)
+
+
+def saturation_curve(T, component, eos="srk", **solver_options):
+    """
+    Solve a saturation curve and evaluate both phases at the solution.
+
+    Parameters:
+        T (ndarray): Temperatures in Kelvin
+        component (dict): Component properties (A, B, C, T_c, P_c, omega)
+        eos (str): "srk" or "pr"
+        **solver_options: Passed to solve_saturation_pressure
+
+    Returns:
+        dict: Arrays "T", "P_sat" (Pa), "Z_liquid", "Z_vapor", "phi" (the common
+        fugacity coefficient), "iterations" and "converged"
+    """
+    T = np.asarray(T, dtype=float)
+    P_sat, iterations, converged = solve_saturation_pressure(T, component, eos, **solver_options)
+    A1, B1 = reduced_coefficients(T, component, eos)
+    _, Z_liquid, Z_vapor, _ = fugacity_residual(A1, B1, P_sat, eos)
+    _, ln_fugacity_coefficient = EOS_MODELS[eos]
+    phi = np.exp(ln_fugacity_coefficient(Z_vapor, A1 * P_sat, B1 * P_sat))
+    return {"T": np.broadcast_to(T, P_sat.shape), "P_sat": P_sat, "Z_liquid": Z_liquid, "Z_vapor": Z_vapor,
+            "phi": phi, "iterations": iterations, "converged": converged}
+
+
+def saturation_properties(T, component, eos="srk", **solver_options):
+    """
+    Solve the saturation pressures, then evaluate the property bundle of
+    both phases there in one pass (see Utility.departure_functions.property_bundle).
+
+    Parameters:
+        T (ndarray): Temperatures in Kelvin
+        component (dict): Component properties (A, B, C, T_c, P_c, omega), scalars or arrays
+        eos (str): "srk" or "pr"
+        **solver_options: Passed to solve_saturation_pressure
+
+    Returns:
+        dict: The property bundle fields plus "T", "P_sat" (Pa), "iterations",
+        "converged" and "enthalpy_of_vaporization" (J/mol, dH_vap at P_sat);
+        every property is NaN where the solve did not converge
+    """
+    T = np.asarray(T, dtype=float)
+    P_sat, iterations, converged = solve_saturation_pressure(T, component, eos, **solver_options)
+    P_sat = np.where(converged, P_sat, np.nan)
+    properties = EOS_PROPERTIES[eos](T, P_sat, component)
+    properties.update({"T": np.broadcast_to(T, P_sat.shape), "P_sat": P_sat, "iterations": iterations,
+                       "converged": converged, "enthalpy_of_vaporization": properties["dH_vap"]})
+    return properties
@@ -0,0 +1,130 @@
+import math
+
+import numpy as np
+from Antoine_equation.antoine import antoine_equation
+from Utility.cubic_solver import z_roots
+from Utility.parameter_cache import ParameterCache, parameter_key
+from Utility.phase_identification import envelope_bounds
+from srk_eos.srk_eos import (srk_dimensionless_parameters, srk_fugacity_residual_derivative,
+                             srk_ln_fugacity_coefficient, srk_properties)
+from peng_robinson.peng_robinson import (peng_robinson_dimensionless_parameters,
+                                         peng_robinson_fugacity_residual_derivative,
+                                         peng_robinson_ln_fugacity_coefficient, peng_robinson_properties)
+
+# EOS name -> (dimensionless parameter function, ln(phi) function)
+EOS_MODELS = {
+    "srk": (srk_dimensionless_parameters, srk_ln_fugacity_coefficient),
+    "pr": (peng_robinson_dimensionless_parameters, peng_robinson_ln_fugacity_coefficient),
+}
+
+# EOS name -> property bundle function (T, P, component) -> dict
+EOS_PROPERTIES = {
+    "srk": srk_properties,
+    "pr": peng_robinson_properties,
+}
+
+# EOS name -> analytic d(ln(phi_L) - ln(phi_V))/dP from (P, Z_liquid, Z_vapor)
+EOS_RESIDUAL_DERIVATIVES = {
+    "srk": srk_fugacity_residual_derivative,
+    "pr": peng_robinson_fugacity_residual_derivative,
+}
+
+def antoine_pressure(T, component):
+    """
+    Antoine estimate of the saturation pressure in Pa, used to seed the solvers.
+    """
+    return antoine_equation(component["A"], component["B"], component["C"], T) * 1e5  # Convert bar to Pa
+
+
+def reduced_coefficients(T, component, eos="srk"):
+    """
+    Pressure-independent part of the cubic: A/P and B/P for each temperature.
+
+    A and B are linear in P at fixed T, so a saturation solve only needs these
+    once per temperature; every later EOS evaluation is A = A1*P, B = B1*P.
+
+    Returns:
+        tuple: (A1, B1) broadcast over T and the component properties
+    """
+    dimensionless_parameters, _ = EOS_MODELS[eos]
+    return dimensionless_parameters(T, 1.0, component)
+
+
+# Spinodal bounds per (eos, component); each entry maps a temperature to its (P_low, P_high)
+spinodal_cache = ParameterCache(maxsize=64)
+
+# Temperatures kept per component; a table that would grow past this starts afresh
+SPINODAL_TABLE_SIZE = 1 << 16
+
+
+def spinodal_pressures(T, component, eos="srk"):
+    """
+    Spinodal pressure bounds of the two-phase envelope at each temperature.
+
+    For scalar component properties the bounds are memoized per temperature
+    in spinodal_cache, so a solve only runs the spinodal bisection for
+    temperatures it has not seen before, whatever array they arrive in.
+
+    Returns:
+        tuple: (P_low, P_high) in Pa, see Utility.phase_identification.envelope_bounds
+    """
+    key = parameter_key(eos, None, component)
+    if key is None:
+        return envelope_bounds(*reduced_coefficients(T, component, eos))
+
+    table = spinodal_cache.get_or_compute(key, dict)
+    T = np.asarray(T, dtype=float)
+    temperatures = T.ravel().tolist()
+    missing = [t for t in temperatures if t not in table]
+    if len(table) + len(missing) > SPINODAL_TABLE_SIZE:
+        table.clear()
+        missing = temperatures
+    if len(missing) == len(temperatures):
+        # Nothing to reuse: bound the whole array in one go
+        P_low, P_high = envelope_bounds(*reduced_coefficients(T, component, eos))
+        table.update(_finite_bounds(temperatures, P_low.ravel().tolist(), P_high.ravel().tolist()))
+        return P_low, P_high
+    if missing:
+        missing = np.array(list(dict.fromkeys(missing)))
+        P_low, P_high = envelope_bounds(*reduced_coefficients(missing, component, eos))
+        table.update(_finite_bounds(missing.tolist(), P_low.tolist(), P_high.tolist()))
+
+    bounds = np.array([table.get(t, (math.nan, math.nan)) for t in temperatures], dtype=float)
+    bounds = bounds.reshape(T.shape + (2,))
+    return bounds[..., 0], bounds[..., 1]
+
+
+def _finite_bounds(temperatures, P_low, P_high):
+    # NaN temperatures (padding) are never stored: every NaN would be a new key
+    return ((t, bounds) for t, bounds in zip(temperatures, zip(P_low, P_high)) if not math.isnan(t))
+
+
+def fugacity_residual(A1, B1, P, eos="srk"):
+    """
+    Evaluate ln(phi_L) - ln(phi_V) from the reduced coefficients.
+
+    Returns:
+        tuple: (residual, Z_liquid, Z_vapor, three_real)
+    """
+    _, ln_fugacity_coefficient = EOS_MODELS[eos]
+    A = A1 * P
+    B = B1 * P
+    Z_liquid, Z_vapor, three_real = z_roots(A, B)
+    residual = ln_fugacity_coefficient(Z_liquid, A, B) - ln_fugacity_coefficient(Z_vapor, A, B)
+    return residual, Z_liquid, Z_vapor, three_real
+
+
+def fugacity_residual_slope(P, Z_liquid, Z_vapor, eos="srk"):
+    """
+    Slope of ln(phi_L) - ln(phi_V) with respect to ln(P), from the EOS
+    module's analytic pressure derivative.
+    """
+    return P * EOS_RESIDUAL_DERIVATIVES[eos](P, Z_liquid, Z_vapor)
+
+
+def single_root_direction(B, Z):
+    """
+    +1 where a single-root state is vapor-like (pressure is below saturation),
+    -1 where it is liquid-like. The split is the inflection point (1 - B)/3 of the cubic.
+    """
+    return np.where(Z > (1 - B) / 3, 1.0, -1.0)
@@ -0,0 +1,136 @@
+import json
+import math
+import os
+
+import numpy as np
+from saturation.psat_solver import saturation_curve
+
+STATUS_CONVERGED = 0
+STATUS_NOT_CONVERGED = 1
+
+RECORD_DTYPE = np.dtype([
+    ("T", np.float64),
+    ("P", np.float64),
+    ("Z_L", np.float64),
+    ("Z_V", np.float64),
+    ("iterations", np.int32),
+    ("status", np.int8),
+])
+
+
+def iter_saturation_chunks(component, eos="srk", T_min=70.0, T_max=None, T_step=1.0, chunk_size=1024,
+                           **solver_options):
+    """
+    Solve a saturation sweep chunk by chunk, yielding each as soon as it is done.
+
+    Only one chunk of temperatures is alive at a time, so memory stays
+    constant however fine or wide the sweep is.
+
+    Parameters:
+        component (dict): Component properties (A, B, C, T_c, P_c, omega)
+        eos (str): "srk" or "pr"
+        T_min (float): First temperature in Kelvin
+        T_max (float): Exclusive upper temperature, defaults to T_c
+        T_step (float): Temperature step in Kelvin
+        chunk_size (int): Temperatures per chunk
+        **solver_options: Passed to solve_saturation_pressure
+
+    Yields:
+        np.recarray: Records of RECORD_DTYPE (T in K, P in Pa)
+    """
+    if T_max is None:
+        T_max = component["T_c"]
+    n_points = max(int(np.ceil((T_max - T_min) / T_step)), 0)
+
+    for start in range(0, n_points, chunk_size):
+        T = T_min + T_step * np.arange(start, min(start + chunk_size, n_points))
+        curve = saturation_curve(T, component, eos, **solver_options)
+
+        chunk = np.recarray(T.shape, dtype=RECORD_DTYPE)
+        chunk["T"] = T
+        chunk["P"] = curve["P_sat"]
+        chunk["Z_L"] = curve["Z_liquid"]
+        chunk["Z_V"] = curve["Z_vapor"]
+        chunk["iterations"] = curve["iterations"]
+        chunk["status"] = np.where(curve["converged"], STATUS_CONVERGED, STATUS_NOT_CONVERGED)
+        yield chunk
+
+
+def write_csv(chunks, stream):
+    """
+    Write record chunks to a text stream as CSV, one header line first.
+    The header is written even when there are no rows.
+
+    Returns:
+        int: Number of rows written
+    """
+    stream.write(",".join(RECORD_DTYPE.names) + "\n")
+    rows = 0
+    for chunk in chunks:
+        np.savetxt(stream, chunk, delimiter=",", fmt=["%.17g", "%.17g", "%.17g", "%.17g", "%d", "%d"])
+        rows += chunk.size
+    return rows
+
+
+def write_ndjson(chunks, stream):
+    """
+    Write record chunks to a text stream as newline-delimited JSON objects.
+    NaN and infinite values are written as null, as in main.py's JSON output.
+
+    Returns:
+        int: Number of rows written
+    """
+    rows = 0
+    for chunk in chunks:
+        names = chunk.dtype.names
+        for record in chunk.tolist():
+            values = [None if isinstance(value, float) and not math.isfinite(value) else value for value in record]
+            stream.write(json.dumps(dict(zip(names, values)), allow_nan=False) + "\n")
+        rows += chunk.size
+    return rows
+
+
+def write_columnar(chunks, directory):
+    """
+    Write record chunks as a columnar dataset: one raw little-endian binary
+    file per field (appended chunk by chunk) plus schema.json, which is
+    written last and records the dtype of each column and the row count.
+
+    Returns:
+        int: Number of rows written
+    """
+    os.makedirs(directory, exist_ok=True)
+    files = {name: open(os.path.join(directory, f"{name}.bin"), "wb") for name in RECORD_DTYPE.names}
+    rows = 0
+    try:
+        for chunk in chunks:
+            for name, f in files.items():
+                f.write(np.ascontiguousarray(chunk[name], dtype=RECORD_DTYPE[name].newbyteorder("<")).tobytes())
+            rows += chunk.size
+    finally:
+        for f in files.values():
+            f.close()
+
+    schema = {"rows": rows,
+              "columns": {name: RECORD_DTYPE[name].newbyteorder("<").str for name in RECORD_DTYPE.names}}
+    with open(os.path.join(directory, "schema.json"), "w") as f:
+        json.dump(schema, f, indent=2)
+    return rows
+
+
+def read_columnar(directory, columns=None):
+    """
+    Open a dataset written by write_columnar; each column is memory-mapped.
+
+    Returns:
+        dict: Column name -> np.memmap, or an empty array of the column dtype
+        when the dataset has no rows (an empty file cannot be mapped)
+    """
+    with open(os.path.join(directory, "schema.json")) as f:
+        schema = json.load(f)
+    names = schema["columns"] if columns is None else columns
+    if schema["rows"] == 0:
+        return {name: np.empty(0, dtype=np.dtype(schema["columns"][name])) for name in names}
+    return {name: np.memmap(os.path.join(directory, f"{name}.bin"), dtype=np.dtype(schema["columns"][name]),
+                            mode="r", shape=(schema["rows"],))
+            for name in names}
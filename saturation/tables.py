@@ -0,0 +1,191 @@
+import bisect
+import math
+
+import numpy as np
+from components.registry import antoine_constants
+from saturation.continuation import eos_critical_point
+from saturation.psat_solver import solve_saturation_pressure
+
+# Lowest temperature of the tables, matching the plotted sweeps in main.py
+TABLE_T_MIN = 70.0
+
+
+def monotone_slopes(x, y):
+    """
+    Fritsch-Carlson node slopes for a monotone piecewise cubic Hermite interpolant (PCHIP).
+    """
+    h = np.diff(x)
+    delta = np.diff(y) / h
+    slopes = np.zeros_like(y)
+
+    # Interior nodes: weighted harmonic mean of neighbouring secants, zero at extrema
+    w1 = 2 * h[1:] + h[:-1]
+    w2 = h[1:] + 2 * h[:-1]
+    same_sign = delta[:-1] * delta[1:] > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        interior = (w1 + w2) / (w1 / delta[:-1] + w2 / delta[1:])
+    slopes[1:-1] = np.where(same_sign, interior, 0.0)
+
+    # One-sided three-point end slopes, limited to keep monotonicity
+    for end, (h0, h1, d0, d1) in ((0, (h[0], h[1], delta[0], delta[1])),
+                                  (-1, (h[-1], h[-2], delta[-1], delta[-2]))):
+        slope = ((2 * h0 + h1) * d0 - h0 * d1) / (h0 + h1)
+        if np.sign(slope) != np.sign(d0):
+            slope = 0.0
+        elif np.sign(d0) != np.sign(d1) and abs(slope) > abs(3 * d0):
+            slope = 3 * d0
+        slopes[end] = slope
+    return slopes
+
+
+class SaturationTable:
+    """
+    Precomputed saturation curve of one component and EOS, served by monotone
+    cubic Hermite interpolation of ln(P) against 1/T.
+
+    ln(P) is close to linear in 1/T (Clausius-Clapeyron), so a modest grid
+    gives a small interpolation error. max_relative_error is the largest
+    |P_table/P_solver - 1| measured against the direct solver at the midpoint
+    of every grid interval when the table was built; it is the documented
+    error bound of the table. Lookups outside [T_min, T_max] raise
+    ValueError; contains() tells which temperatures the table covers.
+    """
+
+    def __init__(self, inverse_T, ln_P, eos, component_name=None, max_relative_error=np.nan):
+        self.inverse_T = np.ascontiguousarray(inverse_T, dtype=float)
+        self.ln_P = np.ascontiguousarray(ln_P, dtype=float)
+        self.slopes = monotone_slopes(self.inverse_T, self.ln_P)
+        self.eos = eos
+        self.component_name = component_name
+        self.max_relative_error = max_relative_error
+        self.T_min = 1.0 / self.inverse_T[-1]
+        self.T_max = 1.0 / self.inverse_T[0]
+        # Plain-float copies for the scalar fast path
+        self._x = self.inverse_T.tolist()
+        self._y = self.ln_P.tolist()
+        self._m = self.slopes.tolist()
+
+    def __call__(self, T):
+        """
+        Saturation pressure in Pa at T (K); scalars and arrays are accepted.
+        """
+        if np.ndim(T) == 0:
+            return self._scalar(float(T))
+        T = np.asarray(T, dtype=float)
+        if not np.all(self.contains(T)):
+            raise ValueError(f"temperatures outside the table range [{self.T_min:g}, {self.T_max:g}] K")
+        return self._vector(T)
+
+    def contains(self, T):
+        """True where T lies inside [T_min, T_max]."""
+        T = np.asarray(T, dtype=float)
+        return (T >= self.T_min) & (T <= self.T_max)
+
+    def _scalar(self, T):
+        if not self.T_min <= T <= self.T_max:
+            raise ValueError(f"T={T:g} K outside the table range [{self.T_min:g}, {self.T_max:g}] K")
+        x = 1.0 / T
+        i = min(max(bisect.bisect_right(self._x, x) - 1, 0), len(self._x) - 2)
+        x0, x1 = self._x[i], self._x[i + 1]
+        h = x1 - x0
+        t = (x - x0) / h
+        t2 = t * t
+        t3 = t2 * t
+        ln_P = ((2 * t3 - 3 * t2 + 1) * self._y[i] + (t3 - 2 * t2 + t) * h * self._m[i]
+                + (-2 * t3 + 3 * t2) * self._y[i + 1] + (t3 - t2) * h * self._m[i + 1])
+        return math.exp(ln_P)
+
+    def _vector(self, T):
+        x = 1.0 / T
+        i = np.clip(np.searchsorted(self.inverse_T, x, side="right") - 1, 0, self.inverse_T.size - 2)
+        x0 = self.inverse_T[i]
+        h = self.inverse_T[i + 1] - x0
+        t = (x - x0) / h
+        t2 = t * t
+        t3 = t2 * t
+        ln_P = ((2 * t3 - 3 * t2 + 1) * self.ln_P[i] + (t3 - 2 * t2 + t) * h * self.slopes[i]
+                + (-2 * t3 + 3 * t2) * self.ln_P[i + 1] + (t3 - t2) * h * self.slopes[i + 1])
+        return np.exp(ln_P)
+
+
+def longest_run(mask):
+    """Slice of the longest stretch of consecutive True entries in a 1-D mask."""
+    best = slice(0, 0)
+    start = None
+    for i, value in enumerate(np.append(mask, False)):
+        if value and start is None:
+            start = i
+        elif not value and start is not None:
+            if i - start > best.stop - best.start:
+                best = slice(start, i)
+            start = None
+    return best
+
+
+def build_saturation_table(component, eos="srk", n_points=400, T_min=TABLE_T_MIN, T_max=None,
+                           component_name=None, **solver_options):
+    """
+    Solve a component once on a dense temperature grid and build a SaturationTable.
+
+    The grid runs from T_min up to T_max, by default the critical point the
+    EOS itself predicts (saturation.continuation.eos_critical_point), which
+    is added as the last node. Nodes are spaced quadratically in 1/T so
+    that they cluster towards the upper end, where ln(P) bends most. The
+    table covers the longest stretch of consecutive converged nodes; its
+    T_min and T_max are the ends of that stretch.
+
+    Parameters:
+        component (dict): Component properties (A, B, C, T_c, P_c, omega)
+        eos (str): "srk" or "pr"
+        n_points (int): Number of grid temperatures
+        T_min (float): Lowest temperature in Kelvin
+        T_max (float): Highest temperature in Kelvin, defaults to the EOS
+            critical temperature and is capped by it
+        component_name (str): Name stored on the table
+        **solver_options: Passed to solve_saturation_pressure
+
+    Returns:
+        SaturationTable
+    """
+    T_critical, P_critical = eos_critical_point(component, eos)
+    T_max = T_critical if T_max is None else min(T_max, T_critical)
+    u = np.linspace(0.0, 1.0, n_points)
+    inverse_T = 1.0 / T_max + (1.0 / T_min - 1.0 / T_max) * u ** 2
+    P_sat, _, converged = solve_saturation_pressure(1.0 / inverse_T, component, eos, **solver_options)
+    if T_max == T_critical:
+        # The solvers find no two-phase envelope at the critical point itself
+        P_sat[0] = P_critical
+        converged[0] = True
+
+    run = longest_run(converged)
+    inverse_T = inverse_T[run]
+    P_sat = P_sat[run]
+    if inverse_T.size < 3:
+        raise ValueError(f"only {inverse_T.size} converged points for {component_name or 'component'} ({eos})")
+
+    table = SaturationTable(inverse_T, np.log(P_sat), eos, component_name)
+
+    # Error bound: compare against the direct solver at every interval midpoint
+    mid_inverse_T = 0.5 * (inverse_T[1:] + inverse_T[:-1])
+    P_mid, _, mid_converged = solve_saturation_pressure(1.0 / mid_inverse_T, component, eos, **solver_options)
+    errors = np.abs(table(1.0 / mid_inverse_T[mid_converged]) / P_mid[mid_converged] - 1)
+    table.max_relative_error = float(errors.max()) if errors.size else np.nan
+    return table
+
+
+def build_saturation_tables(components=None, eos_list=("srk", "pr"), n_points=400, **solver_options):
+    """
+    Build tables for every component and EOS.
+
+    Parameters:
+        components (dict): Component name -> properties, defaults to antoine_constants
+        eos_list (tuple): EOS names to tabulate
+        n_points (int): Grid size of each table
+
+    Returns:
+        dict: (component name, eos) -> SaturationTable
+    """
+    if components is None:
+        components = antoine_constants
+    return {(name, eos): build_saturation_table(component, eos, n_points, component_name=name, **solver_options)
+            for name, component in components.items() for eos in eos_list}
@@ -0,0 +1,379 @@
+"""
+Local property service: Psat, Z and phi for SRK and PR over HTTP.
+
+    python -m service.server --port 8765
+
+    GET  /psat?component=C3&eos=srk&T=300,310
+    GET  /z?component=C3&eos=pr&T=300&P=1e6
+    GET  /phi?component=C3&eos=pr&T=300&P=1e6
+    POST /psat (or /z, /phi) with a JSON body {"component": "C3", "eos": "srk", "T": [...], "P": [...]}
+    GET  /stats
+
+Temperatures are in K and pressures in Pa. Concurrent requests for the same
+quantity, component and EOS that arrive within the batching window are
+merged into one vectorized call. Psat comes from the shared saturation
+tables (relative error below their max_relative_error, about 1e-5) and
+from the solver outside the table range. Malformed queries, including
+non-positive or non-finite T and P, get a 400 reply and failures while
+evaluating a 500 reply, both with a JSON {"error": ...} body.
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from urllib.request import Request, urlopen
+
+import numpy as np
+from components.registry import default_registry
+from Utility.cubic_solver import z_roots
+from saturation.psat_solver import solve_saturation_pressure
+from saturation.residual import EOS_MODELS
+from saturation.tables import build_saturation_table
+
+QUANTITIES = ("psat", "z", "phi")
+
+
+class ServiceError(ValueError):
+    """Bad request: unknown component, EOS or quantity, or malformed values."""
+
+
+class TableCache:
+    """
+    Saturation tables shared by every client, built on first use per
+    (component, EOS) and kept for the life of the service.
+    """
+
+    def __init__(self, registry, n_points=400):
+        self.registry = registry
+        self.n_points = n_points
+        self.tables = {}
+        self.lock = threading.Lock()
+
+    def get(self, name, eos):
+        key = (name, eos)
+        table = self.tables.get(key)
+        if table is None:
+            with self.lock:
+                table = self.tables.get(key)
+                if table is None:
+                    table = build_saturation_table(self.registry[name], eos, self.n_points, component_name=name)
+                    self.tables[key] = table
+        return table
+
+
+def saturation_pressures(T, component, eos, table):
+    """
+    P_sat from the table inside its range, from the solver elsewhere.
+
+    Returns:
+        dict: "P_sat" (NaN where unconverged) and "converged"
+    """
+    converged = table.contains(T)
+    P_sat = np.full(T.shape, np.nan)
+    P_sat[converged] = table(T[converged])
+    missing = ~converged
+    if missing.any():
+        P_solved, _, solved = solve_saturation_pressure(T[missing], component, eos)
+        P_sat[missing] = np.where(solved, P_solved, np.nan)
+        converged[missing] = solved
+    return {"P_sat": P_sat, "converged": converged}
+
+
+def compressibility(T, P, component, eos):
+    """Liquid and vapor compressibility factors; equal where one root exists."""
+    dimensionless_parameters, _ = EOS_MODELS[eos]
+    A, B = dimensionless_parameters(T, P, component)
+    Z_liquid, Z_vapor, three_real = z_roots(A, B)
+    return {"Z_liquid": Z_liquid, "Z_vapor": Z_vapor, "three_real": three_real}
+
+
+def fugacity_coefficients(T, P, component, eos):
+    """Liquid and vapor fugacity coefficients at (T, P)."""
+    dimensionless_parameters, ln_fugacity_coefficient = EOS_MODELS[eos]
+    A, B = dimensionless_parameters(T, P, component)
+    Z_liquid, Z_vapor, three_real = z_roots(A, B)
+    return {"phi_liquid": np.exp(ln_fugacity_coefficient(Z_liquid, A, B)),
+            "phi_vapor": np.exp(ln_fugacity_coefficient(Z_vapor, A, B)), "three_real": three_real}
+
+
+class Batcher:
+    """
+    Coalesces concurrent queries into vectorized calls.
+
+    Request threads submit() a query and block on the returned Future. A
+    single worker thread takes the first waiting query, keeps collecting
+    for `window` seconds (or until max_points are queued), groups what it
+    collected by (quantity, component, EOS), evaluates each group in one
+    call on the concatenated arrays and hands every caller its slice.
+    """
+
+    def __init__(self, registry, tables, window=0.002, max_points=1 << 16):
+        self.registry = registry
+        self.tables = tables
+        self.window = window
+        self.max_points = max_points
+        self.queue = queue.Queue()
+        self.stats = defaultdict(int)
+        self.stats_lock = threading.Lock()
+        self.thread = threading.Thread(target=self._run, name="property-batcher", daemon=True)
+        self.thread.start()
+
+    def submit(self, quantity, name, eos, T, P=None):
+        if quantity not in QUANTITIES:
+            raise ServiceError(f"unknown quantity {quantity!r}, choose one of {', '.join(QUANTITIES)}")
+        if name not in self.registry:
+            raise ServiceError(f"unknown component {name!r}")
+        if eos not in EOS_MODELS:
+            raise ServiceError(f"unknown eos {eos!r}, choose one of {', '.join(EOS_MODELS)}")
+        if T is None:
+            raise ServiceError(f"{quantity} needs T")
+        T = np.atleast_1d(np.asarray(T, dtype=float))
+        if quantity != "psat":
+            if P is None:
+                raise ServiceError(f"{quantity} needs P")
+            T, P = np.broadcast_arrays(T, np.atleast_1d(np.asarray(P, dtype=float)))
+            if not np.all(np.isfinite(P) & (P > 0)):
+                raise ServiceError("pressures must be positive and finite")
+        if T.ndim != 1:
+            raise ServiceError("T and P must be numbers or flat lists")
+        if not np.all(np.isfinite(T) & (T > 0)):
+            raise ServiceError("temperatures must be positive and finite")
+        future = Future()
+        self.queue.put(((quantity, name, eos), T, P, future))
+        return future
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            items = [item]
+            points = item[1].size
+            deadline = time.perf_counter() + self.window
+            closing = False
+            while points < self.max_points:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    closing = True
+                    break
+                items.append(item)
+                points += item[1].size
+            self._evaluate_safely(items)
+            if closing:
+                return
+
+    def _evaluate_safely(self, items):
+        # One failing batch must not end the worker thread and leave every later request waiting
+        try:
+            self._evaluate(items)
+        except Exception as error:
+            for _, _, _, future in items:
+                if not future.done():
+                    future.set_exception(error)
+
+    def _evaluate(self, items):
+        groups = defaultdict(list)
+        for key, T, P, future in items:
+            groups[key].append((T, P, future))
+
+        for (quantity, name, eos), members in groups.items():
+            try:
+                sizes = [T.size for T, _, _ in members]
+                T = np.concatenate([T for T, _, _ in members])
+                component = self.registry[name]
+                if quantity == "psat":
+                    result = saturation_pressures(T, component, eos, self.tables.get(name, eos))
+                else:
+                    P = np.concatenate([P for _, P, _ in members])
+                    evaluate = compressibility if quantity == "z" else fugacity_coefficients
+                    result = evaluate(T, P, component, eos)
+                offsets = np.cumsum([0] + sizes)
+                answers = [{field: values[start:stop] for field, values in result.items()}
+                           for start, stop in zip(offsets[:-1], offsets[1:])]
+            except Exception as error:
+                for _, _, future in members:
+                    future.set_exception(error)
+                continue
+
+            for (_, _, future), answer in zip(members, answers):
+                future.set_result(answer)
+
+            with self.stats_lock:
+                self.stats["batches"] += 1
+                self.stats["requests"] += len(members)
+                self.stats["points"] += int(T.size)
+
+
+def _values(value):
+    # Query-string lists are comma separated; JSON bodies may hold numbers or lists
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [float(v) for v in value.split(",")]
+    return value
+
+
+def _json_values(values):
+    # NaN is not valid JSON; unconverged values are sent as null
+    values = np.asarray(values)
+    if values.dtype.kind != "f":
+        return values.tolist()
+    values = values.astype(object)
+    values[~np.isfinite(values.astype(float))] = None
+    return values.tolist()
+
+
+class PropertyRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/stats":
+            with self.server.batcher.stats_lock:
+                stats = dict(self.server.batcher.stats)
+            stats["tables"] = len(self.server.tables.tables)
+            return self._reply(200, stats)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        self._answer(url.path, query)
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._reply(400, {"error": "body is not valid JSON"})
+        if not isinstance(body, dict):
+            return self._reply(400, {"error": "body must be a JSON object"})
+        self._answer(urlparse(self.path).path, body)
+
+    def _answer(self, path, query):
+        quantity = path.strip("/")
+        if quantity not in QUANTITIES:
+            return self._reply(404, {"error": f"unknown endpoint {path!r}"})
+        # Malformed queries are the client's fault; anything that fails while evaluating is ours
+        try:
+            future = self.server.batcher.submit(quantity, query.get("component"), query.get("eos", "srk"),
+                                                _values(query.get("T")), _values(query.get("P")))
+        except (ServiceError, KeyError, TypeError, ValueError) as error:
+            return self._reply(400, {"error": str(error)})
+        try:
+            result = future.result()
+        except Exception as error:
+            return self._reply(500, {"error": f"{type(error).__name__}: {error}"})
+        self._reply(200, {field: _json_values(values) for field, values in result.items()})
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload, allow_nan=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Many workers connect at once; the socketserver default backlog of 5 resets connections
+    request_queue_size = 256
+
+
+class PropertyService:
+    """
+    Threaded HTTP server around one Batcher and one TableCache.
+
+    Parameters:
+        host (str): Interface to bind, localhost by default
+        port (int): Port, 0 picks a free one (see .url)
+        registry (ComponentRegistry): Components served, defaults to the default registry
+        window (float): Batching window in seconds
+        table_points (int): Grid size of the saturation tables
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, registry=None, window=0.002, table_points=400):
+        registry = default_registry if registry is None else registry
+        self.tables = TableCache(registry, table_points)
+        self.batcher = Batcher(registry, self.tables, window)
+        self.httpd = _HTTPServer((host, port), PropertyRequestHandler)
+        self.httpd.batcher = self.batcher
+        self.httpd.tables = self.tables
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve in a background thread and return self."""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="property-service", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.batcher.close()
+        if self.thread is not None:
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def query(url, quantity, component, eos="srk", T=None, P=None, timeout=30):
+    """
+    Client helper: POST one query to a running service.
+
+    Returns:
+        dict: Field -> list of values (None where unconverged)
+    """
+    body = {"component": component, "eos": eos, "T": np.asarray(T, dtype=float).tolist()}
+    if P is not None:
+        body["P"] = np.asarray(P, dtype=float).tolist()
+    request = Request(f"{url}/{quantity}", data=json.dumps(body).encode(),
+                      headers={"Content-Type": "application/json"})
+    with urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local SRK/PR property service.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="port (default: 8765)")
+    parser.add_argument("--window", type=float, default=0.002, help="batching window in seconds (default: 0.002)")
+    args = parser.parse_args(argv)
+
+    service = PropertyService(args.host, args.port, window=args.window)
+    print(f"serving on {service.url}")
+    try:
+        service.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.httpd.server_close()
+        service.batcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,83 +1,193 @@
 import numpy as np
+from components.registry import antoine_constants, srk_kappa  # noqa: F401
+from Utility.cubic_solver import solve_cubic, z_roots
+from Utility.departure_functions import property_bundle
+from Utility.instrumentation import instrumentation
 
 # Gas constant in J·mol^−1·K^−1
 R = 8.3144598
 
-# Antoine constants for example components (C1, C3, C5, C7, H2O)
-antoine_constants = {
-    "C1": {"A": 3.9895, "B": 443.028, "C": -0.49, "T_c": 190.6, "P_c": 46.1, "omega": 0.011},
-    "C3": {"A": 4.01158, "B": 834.26, "C": -22.763, "T_c": 369.9, "P_c": 42.5, "omega": 0.152},
-    "C5": {"A": 3.9892, "B": 1070.617, "C": -40.454, "T_c": 469.8, "P_c": 33.6, "omega": 0.249},
-    "C7": {"A": 4.81803, "B": 1635.409, "C": -27.338, "T_c": 540, "P_c": 27.4, "omega": 0.302},
-    "H2O": {"A": 4.6543, "B": 1435.264, "C": -64.848, "T_c": 647, "P_c": 220.64, "omega": 0.344},
-}
 
 def srk_parameters(T, component):
+    """
+    Calculate the SRK attraction and co-volume parameters.
+
+    T and the component properties may be NumPy arrays of any broadcastable shape.
+
+    Parameters:
+        T (float or ndarray): Temperature in Kelvin
+        component (dict): Critical properties (T_c, P_c, omega), scalars or arrays
+
+    Returns:
+        tuple: (a, b) broadcast over T and the component properties
+    """
     Tc = component["T_c"]
     Pc = component["P_c"] * 1e5  # Convert P_c from Bar to Pa
-    omega = component["omega"]
 
-    Tr = T / Tc  # Reduced temperature
-    alpha = (1 + (0.48 + 1.574 * omega - 0.176 * omega ** 2) * (1 - np.sqrt(Tr))) ** 2
+    alpha, _ = srk_alpha(T, component)
     a = 0.42748 * (R * Tc) ** 2 * alpha / Pc
     b = 0.08664 * R * Tc / Pc
     return a, b
 
 
-def srk_eos(T, P, component):
+def srk_alpha(T, component):
+    """
+    SRK alpha function and its logarithmic temperature derivative.
+
+    The slope m is the component's "kappa_srk" when given (a fitted value),
+    otherwise the omega correlation.
+
+    Parameters:
+        T (float or ndarray): Temperature in Kelvin
+        component (dict): Critical properties (T_c, omega, optionally kappa_srk), scalars or arrays
+
+    Returns:
+        tuple: (alpha, d ln(alpha)/d ln(T)) broadcast over T and the component properties
+    """
+    m = component["kappa_srk"] if "kappa_srk" in component else srk_kappa(component["omega"])
+    sqrt_Tr = np.sqrt(np.asarray(T) / component["T_c"])
+    root = 1 + m * (1 - sqrt_Tr)
+    return root ** 2, -m * sqrt_Tr / root
+
 
+def srk_dimensionless_parameters(T, P, component):
+    """
+    Calculate the dimensionless SRK parameters A = a*P/(R*T)**2 and B = b*P/(R*T).
+
+    Parameters:
+        T (float or ndarray): Temperature in Kelvin
+        P (float or ndarray): Pressure in Pa
+        component (dict): Critical properties (T_c, P_c, omega), scalars or arrays
+
+    Returns:
+        tuple: (A, B) broadcast over T, P and the component properties
+    """
+    T = np.asarray(T, dtype=float)
     a, b = srk_parameters(T, component)
     A = (a * P) / (R ** 2 * T ** 2)
     B = (b * P) / (R * T)
+    return A, B
 
-    # SRK cubic equation coefficients
-    coeffs = [1, -(1 - B), A - 2 * B - 3 * B ** 2, -(A * B - B ** 2 - B ** 3)]
 
-    # Solve cubic equation for Z
-    Z_roots = np.roots(coeffs)
-    Z_real = [z.real for z in Z_roots if np.isreal(z) and z.real > 0]
+def srk_eos(T, P, component):
+    """
+    Positive real roots of the SRK cubic at a single state.
+
+    Returns:
+        tuple: (Z_real, A, B) with Z_real a list of floats in descending
+        order, as np.roots gives them: Z_real[0] is the vapor root.
+    """
+    A, B = srk_dimensionless_parameters(T, P, component)
+
+    # Solve the SRK cubic equation for Z in closed form
+    roots, three_real = solve_cubic(-(1 - B), A - 2 * B - 3 * B ** 2, -(A * B - B ** 2 - B ** 3))
+    roots = roots[::-1] if three_real else roots[-1:]
+    Z_real = [float(z) for z in roots if z > 0]
     return Z_real, A, B
 
 
+def srk_z_factors(T, P, component):
+    """
+    Array version of srk_eos returning the liquid and vapor roots separately.
+
+    Parameters:
+        T (float or ndarray): Temperature in Kelvin
+        P (float or ndarray): Pressure in Pa
+        component (dict): Critical properties (T_c, P_c, omega), scalars or arrays
+
+    Returns:
+        tuple: (Z_liquid, Z_vapor, A, B). Where only one real root exists
+        Z_liquid and Z_vapor are equal.
+    """
+    A, B = srk_dimensionless_parameters(T, P, component)
+    Z_liquid, Z_vapor, _ = z_roots(A, B)
+    return Z_liquid, Z_vapor, A, B
+
+
+def srk_ln_fugacity_coefficient(Z, A, B):
+    """
+    Natural log of the fugacity coefficient, clipped to [-700, 700] so that
+    np.exp never overflows. Works element-wise on arrays.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ln_phi = Z - 1 - np.log(Z - B) - (A / (2 * np.sqrt(2) * B)) * np.log(
+            (Z + (1 + np.sqrt(2)) * B) / (Z + (1 - np.sqrt(2)) * B)
+        )
+    if instrumentation.enabled:
+        instrumentation.count("fugacity_evaluations", np.size(ln_phi))
+    return np.clip(ln_phi, -700, 700)  # np.exp(700) is the maximum safe value
+
+
 def srk_fugacity_coefficient(Z, A, B):
-    ln_phi = Z - 1 - np.log(Z - B) - (A / (2 * np.sqrt(2) * B)) * np.log(
-        (Z + (1 + np.sqrt(2)) * B) / (Z + (1 - np.sqrt(2)) * B)
-    )
+    return np.exp(srk_ln_fugacity_coefficient(Z, A, B))
 
-    if ln_phi > 700:  # np.exp(700) is the maximum safe value
-        ln_phi = 700
-    elif ln_phi < -700:  # Prevent underflow
-        ln_phi = -700
 
-    phi = np.exp(ln_phi)
-    return phi
+def srk_fugacity_residual(T, P, component):
+    """
+    Fugacity-equality residual ln(phi_L) - ln(phi_V) over arrays of states.
 
-def srk_straight_fugacity_coefficient(T, P, component):
-    a, b = srk_parameters(T, component)
-    A = (a * P) / (R ** 2 * T ** 2)
-    B = (b * P) / (R * T)
+    The residual is zero at the saturation pressure. At states with a single
+    real root both phases collapse onto it and the residual is zero as well,
+    so callers should check Z_liquid < Z_vapor.
+
+    Parameters:
+        T (float or ndarray): Temperature in Kelvin
+        P (float or ndarray): Pressure in Pa
+        component (dict): Critical properties (T_c, P_c, omega), scalars or arrays
+
+    Returns:
+        tuple: (residual, Z_liquid, Z_vapor)
+    """
+    Z_liquid, Z_vapor, A, B = srk_z_factors(T, P, component)
+    residual = srk_ln_fugacity_coefficient(Z_liquid, A, B) - srk_ln_fugacity_coefficient(Z_vapor, A, B)
+    return residual, Z_liquid, Z_vapor
 
-    # SRK cubic equation coefficients
-    coeffs = [1, -(1 - B), A - 2 * B - 3 * B ** 2, -(A * B - B ** 2 - B ** 3)]
 
-    # Solve cubic equation for Z
-    Z_roots = np.roots(coeffs)
-    Z_real = [z.real for z in Z_roots if np.isreal(z) and z.real > 0]
+def srk_fugacity_residual_derivative(P, Z_liquid, Z_vapor):
+    """
+    Analytic pressure derivative of the residual ln(phi_L) - ln(phi_V) at constant T.
 
+    Differentiating ln(phi) through the cubic, with dZ/dP taken implicitly
+    from the cubic itself, every A- and B-dependent term cancels and leaves
+    d ln(phi)/dP = (Z - 1)/P for each root. The residual derivative is
+    therefore (Z_L - Z_V)/P and needs no extra cubic solves.
 
-    Z = max(Z_real)
+    Parameters:
+        P (float or ndarray): Pressure in Pa
+        Z_liquid (float or ndarray): Liquid compressibility factor at P
+        Z_vapor (float or ndarray): Vapor compressibility factor at P
 
-    ln_phi = Z - 1 - np.log(Z - B) - (A / (2 * np.sqrt(2) * B)) * np.log(
-        (Z + (1 + np.sqrt(2)) * B) / (Z + (1 - np.sqrt(2)) * B)
-    )
+    Returns:
+        float or ndarray: d(ln(phi_L) - ln(phi_V))/dP in 1/Pa
+    """
+    return (Z_liquid - Z_vapor) / P
+
+
+def srk_properties(T, P, component):
+    """
+    Liquid and vapor volumes, densities, ln(phi) and residual enthalpy and
+    entropy at (T, P) from one cubic solve; see
+    Utility.departure_functions.property_bundle for the fields.
+
+    Parameters:
+        T (float or ndarray): Temperature in Kelvin
+        P (float or ndarray): Pressure in Pa
+        component (dict): Critical properties (T_c, P_c, omega), scalars or arrays
+
+    Returns:
+        dict: Property arrays broadcast over T, P and the component properties
+    """
+    T = np.asarray(T, dtype=float)
+    A, B = srk_dimensionless_parameters(T, P, component)
+    _, dln_alpha_dln_T = srk_alpha(T, component)
+    return property_bundle(T, P, A, B, dln_alpha_dln_T)
+
+
+def srk_straight_fugacity_coefficient(T, P, component):
+    _, Z_vapor, A, B = srk_z_factors(T, P, component)
+    return srk_fugacity_coefficient(Z_vapor, A, B)
 
-    if ln_phi > 700:  # np.exp(700) is the maximum safe value
-        ln_phi = 700
-    elif ln_phi < -700:  # Prevent underflow
-        ln_phi = -700
 
-    phi = np.exp(ln_phi)
-    return phi
 # # Example calculation for C1 at T = 120 K and P = 1 atm
 # T = 120  # Temperature in Kelvin
 # P = 101325  # Pressure in Pa (1 atm)
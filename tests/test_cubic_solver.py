@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from Utility.cubic_solver import solve_cubic, spinodal_B, z_roots
+
+
+def coefficients(A, B):
+    return -(1 - B), A - 2 * B - 3 * B ** 2, -(A * B - B ** 2 - B ** 3)
+
+
+def numpy_real_roots(A, B):
+    roots = np.roots((1.0,) + coefficients(A, B))
+    return np.sort(roots[np.abs(roots.imag) < 1e-9 * np.abs(roots)].real)
+
+
+@pytest.mark.parametrize("A, B", [
+    (0.05, 0.01),  # one root, vapor-like
+    (0.3, 0.02),  # one root, liquid-like
+    (2.0, 0.3),
+    (0.02, 1e-4),  # three roots
+    (1e-3, 1e-6),  # three roots, liquid root six decades below the vapor root
+])
+def test_roots_match_numpy(A, B):
+    expected = numpy_real_roots(A, B)
+    three_real = expected.size == 3
+    scalar_roots, scalar_three_real = solve_cubic(*coefficients(A, B))
+    array_roots, array_three_real = solve_cubic(*(np.full(2, c) for c in coefficients(A, B)))
+    assert scalar_three_real == three_real
+    np.testing.assert_array_equal(array_three_real, three_real)
+    if not three_real:
+        expected = np.repeat(expected, 3)
+    np.testing.assert_allclose(scalar_roots, expected, rtol=1e-10)
+    np.testing.assert_allclose(array_roots, np.broadcast_to(expected, (2, 3)), rtol=1e-10)
+
+    Z_liquid, Z_vapor, z_three_real = z_roots(A, B)
+    assert z_three_real == three_real
+    np.testing.assert_allclose([Z_liquid, Z_vapor], expected[[0, 2]], rtol=1e-10)
+
+
+@pytest.mark.parametrize("beta", [0.02, 0.1, 0.17])
+@pytest.mark.parametrize("relative_shift", [-1e-9, 0.0, 1e-9])
+def test_near_double_root(beta, relative_shift):
+    # On a spinodal two roots merge; which side of it a state falls on is down to round-off
+    B_min, B_max = spinodal_B(beta)
+    B = np.array([B_min, B_max]) * (1 + relative_shift)
+    B = B[B > 0]
+    A = B / beta
+    c2, c1, c0 = coefficients(A, B)
+    roots, three_real = solve_cubic(c2, c1, c0)
+    for row in range(B.size):
+        expected = np.sort(np.roots((1.0, c2[row], c1[row], c0[row])).real)
+        # The simple root is well conditioned, the merging pair only to about sqrt(round-off)
+        simple = expected[np.argmax(np.abs(expected - np.median(expected)))]
+        assert np.min(np.abs(roots[row] - simple)) < 1e-10 * simple
+        if three_real[row]:
+            np.testing.assert_allclose(roots[row], expected, rtol=1e-3)
+        else:
+            np.testing.assert_allclose(roots[row], simple, rtol=1e-10)
+        Z = roots[row]
+        assert np.all(np.abs(((Z + c2[row]) * Z + c1[row]) * Z + c0[row]) < 1e-12)
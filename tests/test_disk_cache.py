@@ -0,0 +1,46 @@
+import numpy as np
+from components.registry import antoine_constants
+from saturation import disk_cache
+
+T = np.linspace(150.0, 300.0, 16)
+COMPONENT = antoine_constants["C3"]
+
+
+def counting_solver(monkeypatch):
+    calls = []
+    solve = disk_cache.saturation_curve
+
+    def saturation_curve(*args, **kwargs):
+        calls.append(args)
+        return solve(*args, **kwargs)
+
+    monkeypatch.setattr(disk_cache, "saturation_curve", saturation_curve)
+    return calls
+
+
+def test_hit_reuses_the_stored_curve(tmp_path, monkeypatch):
+    calls = counting_solver(monkeypatch)
+    first = disk_cache.cached_saturation_curve(T, COMPONENT, "srk", name="C3", cache_dir=tmp_path)
+    second = disk_cache.cached_saturation_curve(T, COMPONENT, "srk", name="C3", cache_dir=tmp_path)
+    assert len(calls) == 1
+    np.testing.assert_array_equal(first["P_sat"], second["P_sat"])
+
+
+def test_version_mismatch_forces_recompute(tmp_path, monkeypatch):
+    calls = counting_solver(monkeypatch)
+    with monkeypatch.context() as old:
+        old.setattr(disk_cache, "CACHE_VERSION", disk_cache.CACHE_VERSION - 1)
+        disk_cache.cached_saturation_curve(T, COMPONENT, "srk", name="C3", cache_dir=tmp_path)
+    curve = disk_cache.cached_saturation_curve(T, COMPONENT, "srk", name="C3", cache_dir=tmp_path)
+    assert len(calls) == 2
+    assert disk_cache.read_curve(tmp_path / "C3_srk.vpsc") is not None
+    assert np.all(curve["converged"] > 0)
+
+
+def test_numerics_change_forces_recompute(tmp_path, monkeypatch):
+    calls = counting_solver(monkeypatch)
+    with monkeypatch.context() as old:
+        old.setattr(disk_cache, "numerics_fingerprint", lambda: "solver code before the change")
+        disk_cache.cached_saturation_curve(T, COMPONENT, "srk", name="C3", cache_dir=tmp_path)
+    disk_cache.cached_saturation_curve(T, COMPONENT, "srk", name="C3", cache_dir=tmp_path)
+    assert len(calls) == 2
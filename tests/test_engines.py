@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+from components.registry import antoine_constants
+from saturation.psat_solver import solve_saturation_pressure
+
+
+@pytest.mark.parametrize("name, eos", [("C5", "srk"), ("C7", "pr")])
+@pytest.mark.parametrize("engine", ["bracketed", "auto", "jit"])
+def test_engine_matches_newton(name, eos, engine):
+    component = antoine_constants[name]
+    T = np.linspace(0.3, 0.95, 60) * component["T_c"]
+    P_newton, iterations_newton, converged_newton = solve_saturation_pressure(T, component, eos, engine="newton",
+                                                                              tolerance=1e-12)
+    P_sat, iterations, converged = solve_saturation_pressure(T, component, eos, engine=engine, tolerance=1e-12)
+    # Temperatures above the EOS critical point are unconverged for every engine
+    np.testing.assert_array_equal(converged, converged_newton)
+    assert converged.sum() > 50
+    np.testing.assert_allclose(P_sat[converged], P_newton[converged], rtol=1e-12)
+    # A converged Newton step is kept, not traded for a bisection of the bracket
+    assert iterations.max() <= iterations_newton.max() + 1
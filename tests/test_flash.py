@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+from mixture.flash import pt_flash
+from mixture.mixture import Mixture, bubble_pressure
+
+MIXTURE = Mixture(["C1", "C3", "C5"])
+FEED = np.array([0.3, 0.3, 0.4])
+
+
+@pytest.mark.parametrize("accelerate", [5, 0])
+def test_compressed_liquid_is_liquid(accelerate):
+    # Far above the bubble pressure (about 6 MPa) the feed is a single liquid phase
+    result = pt_flash(300.0, 20e6, FEED, MIXTURE, "pr", accelerate=accelerate)
+    assert result["stable"]
+    assert not result["two_phase"]
+    assert result["beta"] == 0.0
+    np.testing.assert_allclose(result["x"], FEED)
+
+
+@pytest.mark.parametrize("accelerate", [5, 0])
+def test_split_between_bubble_and_dew_pressure(accelerate):
+    P_bubble = bubble_pressure(300.0, FEED, MIXTURE, "pr")[0]
+    result = pt_flash(300.0, [1e4, 0.5 * P_bubble, 1.05 * P_bubble], FEED, MIXTURE, "pr", accelerate=accelerate)
+    np.testing.assert_array_equal(result["two_phase"], [False, True, False])
+    np.testing.assert_array_equal(result["beta"][[0, 2]], [1.0, 0.0])
+    assert result["converged"].all()
@@ -0,0 +1,33 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+
+import pytest
+from service.server import PropertyService, query
+
+
+@pytest.fixture
+def service():
+    # A wide window so that concurrent requests land in the same batch
+    with PropertyService(window=0.2, table_points=50) as service:
+        yield service
+
+
+def answer(url, quantity, T, P=None):
+    try:
+        return 200, query(url, quantity, "C3", "pr", T, P, timeout=10)
+    except HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def test_mixed_shapes_in_one_batch(service):
+    with ThreadPoolExecutor(2) as pool:
+        nested = pool.submit(answer, service.url, "z", [[300.0, 310.0], [320.0, 330.0]], 1e5)
+        flat = pool.submit(answer, service.url, "z", [300.0, 310.0], [1e5, 2e5])
+        (nested_status, nested_body), (flat_status, flat_body) = nested.result(), flat.result()
+    assert nested_status == 400 and "error" in nested_body
+    assert flat_status == 200 and len(flat_body["Z_vapor"]) == 2
+
+    # The worker thread is still serving
+    status, body = answer(service.url, "phi", [300.0], [1e5])
+    assert status == 200 and len(body["phi_vapor"]) == 1
@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+from components.registry import antoine_constants
+from saturation.streaming import RECORD_DTYPE, iter_saturation_chunks, read_columnar, write_columnar
+
+COMPONENT = antoine_constants["C3"]
+
+
+@pytest.mark.parametrize("T_min, T_max", [(150.0, 200.0), (200.0, 200.0)])
+def test_columnar_round_trip(tmp_path, T_min, T_max):
+    chunks = list(iter_saturation_chunks(COMPONENT, "srk", T_min, T_max, T_step=5.0, chunk_size=4))
+    expected = np.concatenate(chunks) if chunks else np.empty(0, dtype=RECORD_DTYPE)
+    assert write_columnar(chunks, tmp_path) == expected.size
+    columns = read_columnar(tmp_path)
+    for name in RECORD_DTYPE.names:
+        assert columns[name].dtype == RECORD_DTYPE[name]
+        np.testing.assert_array_equal(columns[name], expected[name])